@@ -14,6 +14,8 @@ class ZepAdapter(BaseAdapter):
     Zep Cloud formats, handling special cases like tool calls and non-text modalities.
     """
     
+    ROLE_TYPES = {"norole", "system", "assistant", "user", "function", "tool"}
+    
     def to_external_format(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Convert Agent C messages to Zep Cloud format.
         
@@ -23,8 +25,25 @@ class ZepAdapter(BaseAdapter):
         Returns:
             List of messages in the Zep Cloud format
         """
-        # Implementation to be added
-        pass
+        external = []
+        for message in messages:
+            role = message.get("role") or "norole"
+            role_type = message.get("role_type")
+            if role_type not in self.ROLE_TYPES:
+                role_type = role if role in self.ROLE_TYPES else "norole"
+            metadata = dict(message.get("metadata") or {})
+            timestamp = message.get("timestamp")
+            if timestamp is not None:
+                metadata.setdefault("timestamp", timestamp.isoformat()
+                                    if hasattr(timestamp, "isoformat") else str(timestamp))
+
+            external.append({
+                "role": role,
+                "role_type": role_type,
+                "content": message.get("content") or "",
+                "metadata": metadata,
+            })
+        return external
     
     def to_application_format(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Convert Zep Cloud messages to Agent C format.
@@ -35,5 +54,20 @@ class ZepAdapter(BaseAdapter):
         Returns:
             List of messages in the Agent C format
         """
-        # Implementation to be added
-        pass
\ No newline at end of file
+        application = []
+        for message in messages:
+            metadata = dict(message.get("metadata") or {})
+            timestamp = metadata.pop("timestamp", None) or message.get("created_at")
+            if message.get("uuid"):
+                metadata.setdefault("zep_uuid", message["uuid"])
+
+            converted = {
+                "role": message.get("role") or message.get("role_type") or "norole",
+                "role_type": message.get("role_type"),
+                "content": message.get("content") or "",
+                "metadata": metadata,
+            }
+            if timestamp is not None:
+                converted["timestamp"] = timestamp
+            application.append(converted)
+        return application
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""Load generation for the Agent C Session Manager.
+
+Provides a fake Zep backend with a latency and error model, workload profiles and a runner
+that drives ChatSessionRepo with many concurrent simulated sessions.
+Run with `python -m agent_c_session.loadgen --help`.
+"""
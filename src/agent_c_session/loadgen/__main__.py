@@ -0,0 +1,86 @@
+"""Command line entry point for load generation.
+
+Examples:
+    python -m agent_c_session.loadgen run --profile chat --sessions 5000 --duration 60 -o chat.json
+    python -m agent_c_session.loadgen run --trace recorded.ndjson -o replay.json
+    python -m agent_c_session.loadgen compare baseline.json chat.json
+"""
+import argparse
+import asyncio
+import sys
+from typing import List, Optional
+
+from agent_c_session.loadgen.profiles import PROFILES, get_profile, read_trace
+from agent_c_session.loadgen.runner import LoadReport, LoadRunner, compare_reports
+
+
+def _print_report(report: LoadReport) -> None:
+    print(f"profile {report.profile}: {report.sessions} sessions, {report.total_operations} ops "
+          f"in {report.duration:.1f}s ({report.throughput:.1f} ops/s), "
+          f"{report.backend_calls} backend calls")
+    print(f"{'operation':<20}{'count':>10}{'errors':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    rows = list(report.operations.items()) + [("(loop lag)", report.loop_lag)]
+    for name, stats in rows:
+        print(f"{name:<20}{stats.count:>10}{stats.errors:>8}{stats.p50:>10.2f}{stats.p90:>10.2f}"
+              f"{stats.p99:>10.2f}{stats.max:>10.2f}")
+    if report.peak_rss_mb is not None:
+        print(f"peak rss: {report.peak_rss_mb:.1f} MiB")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the load generation command line.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        The process exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m agent_c_session.loadgen",
+                                     description="Simulate multi-tenant agent traffic against ChatSessionRepo")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run a workload profile or replay a trace")
+    run.add_argument("--profile", default="chat",
+                     help=f"Built-in profile ({', '.join(sorted(PROFILES))}) or a JSON profile file")
+    run.add_argument("--trace", help="NDJSON trace to replay instead of the profile's random workload")
+    run.add_argument("--sessions", type=int, help="Override the number of concurrent sessions")
+    run.add_argument("--duration", type=float, help="Override the run length in seconds")
+    run.add_argument("--seed", type=int, help="Seed for the workload and backend models")
+    run.add_argument("-o", "--output", help="Write the report as JSON to this file")
+
+    compare = commands.add_parser("compare", help="Compare two saved reports")
+    compare.add_argument("baseline", help="Report of the reference run")
+    compare.add_argument("current", help="Report of the run to compare")
+
+    commands.add_parser("profiles", help="List the built-in profiles")
+
+    args = parser.parse_args(argv)
+    if args.command == "profiles":
+        for name, profile in sorted(PROFILES.items()):
+            print(f"{name}: {profile.model_dump_json()}")
+        return 0
+
+    if args.command == "compare":
+        for line in compare_reports(LoadReport.load(args.baseline), LoadReport.load(args.current)):
+            print(line)
+        return 0
+
+    try:
+        profile = get_profile(args.profile, args.sessions, args.duration)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.seed is not None:
+        profile.backend.seed = args.seed
+
+    runner = LoadRunner(profile)
+    trace = read_trace(args.trace) if args.trace else None
+    report = asyncio.run(runner.run(trace, trace_name=args.trace))
+    _print_report(report)
+    if args.output:
+        report.save(args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Fake Zep backend for load generation.
+
+Provides an in-memory stand-in for the parts of `AsyncZep` used by ChatSessionRepo, with a
+configurable latency and error model so the repo can be exercised without a network.
+"""
+import asyncio
+import random
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from zep_cloud.core.api_error import ApiError
+from zep_cloud.errors import ConflictError, NotFoundError
+import zep_cloud.types as zep_types
+
+
+class BackendModel(BaseModel):
+    """Latency and error model of the fake backend.
+
+    Latencies are drawn from a log-normal distribution around the median.
+
+    Attributes:
+        median_latency: Median latency of an upstream call in seconds
+        latency_sigma: Shape of the log-normal latency distribution
+        error_rate: Fraction of calls failing with a 500
+        rate_limit_rate: Fraction of calls rejected with a 429
+        seed: Seed for the random generator, None for a random seed
+    """
+
+    median_latency: float = Field(0.02, description="Median call latency in seconds")
+    latency_sigma: float = Field(0.5, description="Log-normal shape of the latency")
+    error_rate: float = Field(0.0, description="Fraction of calls failing with a 500")
+    rate_limit_rate: float = Field(0.0, description="Fraction of calls rejected with a 429")
+    seed: Optional[int] = Field(None, description="Random seed")
+
+
+class _FakeNamespace:
+    def __init__(self, backend: "FakeZepBackend"):
+        self._backend = backend
+
+
+class _FakeUserClient(_FakeNamespace):
+    async def add(self, user_id: str, **kwargs: Any) -> zep_types.User:
+        await self._backend.simulate()
+        self._backend.users[user_id] = {"user_id": user_id, **kwargs}
+        return zep_types.User(user_id=user_id)
+
+    async def update(self, user_id: str, **kwargs: Any) -> zep_types.User:
+        await self._backend.simulate()
+        self._backend.require_user(user_id).update(kwargs)
+        return zep_types.User(user_id=user_id)
+
+    async def delete(self, user_id: str, **kwargs: Any) -> None:
+        await self._backend.simulate()
+        self._backend.require_user(user_id)
+        del self._backend.users[user_id]
+
+    async def get(self, user_id: str, **kwargs: Any) -> zep_types.User:
+        await self._backend.simulate()
+        return zep_types.User(**self._backend.require_user(user_id))
+
+    async def get_sessions(self, user_id: str, **kwargs: Any) -> List[zep_types.Session]:
+        await self._backend.simulate()
+        return [self._backend.session_model(session_id)
+                for session_id, session in self._backend.sessions.items() if session["user_id"] == user_id]
+
+
+class _FakeMemoryClient(_FakeNamespace):
+    async def add_session(self, session_id: str, user_id: str,
+                          metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> zep_types.Session:
+        await self._backend.simulate()
+        if session_id in self._backend.sessions:
+            raise ConflictError(body=f"session {session_id} already exists")
+        self._backend.sessions[session_id] = {"user_id": user_id, "metadata": metadata or {},
+                                              "created_at": datetime.now().isoformat(), "messages": []}
+        return self._backend.session_model(session_id)
+
+    async def get_session(self, session_id: str, **kwargs: Any) -> zep_types.Session:
+        await self._backend.simulate()
+        self._backend.require_session(session_id)
+        return self._backend.session_model(session_id)
+
+    async def update_session(self, session_id: str, metadata: Dict[str, Any],
+                             **kwargs: Any) -> zep_types.Session:
+        await self._backend.simulate()
+        self._backend.require_session(session_id)["metadata"] = metadata
+        return self._backend.session_model(session_id)
+
+    async def delete(self, session_id: str, **kwargs: Any) -> None:
+        await self._backend.simulate()
+        self._backend.require_session(session_id)
+        del self._backend.sessions[session_id]
+
+    async def add(self, session_id: str, messages: List[zep_types.Message], **kwargs: Any) -> None:
+        await self._backend.simulate()
+        self._backend.require_session(session_id)["messages"].extend(messages)
+
+    async def get(self, session_id: str, lastn: Optional[int] = None, **kwargs: Any) -> zep_types.Memory:
+        await self._backend.simulate()
+        messages = self._backend.require_session(session_id)["messages"]
+        return zep_types.Memory(messages=messages[-lastn:] if lastn else list(messages))
+
+    async def get_session_messages(self, session_id: str, limit: Optional[int] = None,
+                                   cursor: Optional[int] = None,
+                                   **kwargs: Any) -> zep_types.MessageListResponse:
+        await self._backend.simulate()
+        messages = self._backend.require_session(session_id)["messages"]
+        limit = limit or len(messages)
+        start = ((cursor or 1) - 1) * limit
+        return zep_types.MessageListResponse(messages=messages[start:start + limit],
+                                             total_count=len(messages))
+
+
+class FakeZepBackend:
+    """In-memory fake of the AsyncZep client.
+
+    Exposes `user` and `memory` namespaces with the methods ChatSessionRepo calls. Every call
+    sleeps for a latency drawn from the model and may fail according to its error rates.
+
+    Attributes:
+        model: The latency and error model
+        users: Stored users keyed by user_id
+        sessions: Stored sessions keyed by session_id
+        calls: Number of upstream calls made
+    """
+
+    def __init__(self, model: Optional[BackendModel] = None):
+        """Initialize an empty backend.
+
+        Args:
+            model: The latency and error model, defaults to BackendModel()
+        """
+        self.model = model or BackendModel()
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.calls = 0
+        self._random = random.Random(self.model.seed)
+        self.user = _FakeUserClient(self)
+        self.memory = _FakeMemoryClient(self)
+
+    async def simulate(self) -> None:
+        """Apply the latency and error model to a call.
+
+        Raises:
+            ApiError: With status 429 or 500 according to the error rates
+        """
+        self.calls += 1
+        model = self.model
+        if model.median_latency > 0:
+            await asyncio.sleep(model.median_latency * self._random.lognormvariate(0, model.latency_sigma))
+
+        roll = self._random.random()
+        if roll < model.rate_limit_rate:
+            raise ApiError(status_code=429, body="rate limited")
+        if roll < model.rate_limit_rate + model.error_rate:
+            raise ApiError(status_code=500, body="simulated failure")
+
+    def require_user(self, user_id: str) -> Dict[str, Any]:
+        """Get a stored user or raise the error Zep would.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            The stored user
+        """
+        if user_id not in self.users:
+            raise NotFoundError(body=f"user {user_id} not found")
+        return self.users[user_id]
+
+    def require_session(self, session_id: str) -> Dict[str, Any]:
+        """Get a stored session or raise the error Zep would.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            The stored session
+        """
+        if session_id not in self.sessions:
+            raise NotFoundError(body=f"session {session_id} not found")
+        return self.sessions[session_id]
+
+    def session_model(self, session_id: str) -> zep_types.Session:
+        """Build the Zep session object for a stored session.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            The Zep session object
+        """
+        session = self.sessions[session_id]
+        return zep_types.Session(session_id=session_id, user_id=session["user_id"],
+                                 metadata=session["metadata"], created_at=session["created_at"])
@@ -0,0 +1,148 @@
+"""Workload profiles and traces for load generation.
+
+Provides the declarative description of a simulated multi-tenant workload and the recorded
+trace format that can be replayed instead of a profile.
+"""
+import json
+from typing import Dict, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+from agent_c_session.loadgen.fake_backend import BackendModel
+
+OPERATIONS = ["new_session", "add_interaction", "add_tool_call", "set_managed_meta", "get_messages",
+              "get_user_session", "flush"]
+
+
+class WorkloadProfile(BaseModel):
+    """A simulated workload.
+
+    Each simulated session creates itself with `new_session` and then repeatedly picks an
+    operation according to the weights, pausing for an exponentially distributed think time
+    between operations.
+
+    Attributes:
+        name: Name of the profile
+        sessions: Number of concurrent simulated sessions
+        users: Number of users the sessions are spread over
+        duration: Length of the run in seconds
+        think_time: Mean pause between two operations of a session in seconds
+        operations: Relative weight of each operation
+        interaction_size: Number of messages per add_interaction
+        scheduler_rate: Request scheduler rate limit in requests per second
+        backend: Latency and error model of the fake backend
+    """
+
+    name: str = Field(..., description="Name of the profile")
+    sessions: int = Field(100, description="Concurrent simulated sessions")
+    users: int = Field(10, description="Users the sessions are spread over")
+    duration: float = Field(30.0, description="Length of the run in seconds")
+    think_time: float = Field(0.05, description="Mean pause between operations in seconds")
+    operations: Dict[str, float] = Field(default_factory=dict, description="Operation weights")
+    interaction_size: int = Field(2, description="Messages per add_interaction")
+    scheduler_rate: float = Field(100000.0, description="Scheduler rate limit in requests per second")
+    backend: BackendModel = Field(default_factory=BackendModel, description="Fake backend model")
+
+    @classmethod
+    def load(cls, path: str) -> "WorkloadProfile":
+        """Load a profile from a JSON file.
+
+        Args:
+            path: Path of the JSON file
+
+        Returns:
+            The loaded profile
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.model_validate_json(f.read())
+
+
+class TraceEvent(BaseModel):
+    """A recorded operation to replay.
+
+    Attributes:
+        at: Offset in seconds from the start of the run
+        session: Key of the simulated session the operation belongs to
+        user_id: ID of the user owning the session
+        op: Name of the operation
+    """
+
+    at: float = Field(..., description="Offset from the start of the run in seconds")
+    session: str = Field(..., description="Key of the simulated session")
+    user_id: str = Field("user-0", description="ID of the user owning the session")
+    op: str = Field(..., description="Name of the operation")
+
+
+def read_trace(path: str) -> Iterator[TraceEvent]:
+    """Stream a recorded trace from an NDJSON file.
+
+    Args:
+        path: Path of the trace file, one TraceEvent per line ordered by `at`
+
+    Yields:
+        The recorded operations
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield TraceEvent(**json.loads(line))
+
+
+PROFILES: Dict[str, WorkloadProfile] = {
+    "chat": WorkloadProfile(
+        name="chat",
+        sessions=5000,
+        users=500,
+        operations={"add_interaction": 50, "get_messages": 25, "flush": 15, "set_managed_meta": 5,
+                    "get_user_session": 5},
+    ),
+    "agent": WorkloadProfile(
+        name="agent",
+        sessions=2000,
+        users=200,
+        operations={"add_interaction": 25, "add_tool_call": 35, "set_managed_meta": 15,
+                    "get_messages": 10, "flush": 15},
+    ),
+    "flaky": WorkloadProfile(
+        name="flaky",
+        sessions=1000,
+        users=100,
+        operations={"add_interaction": 50, "get_messages": 20, "flush": 20, "get_user_session": 10},
+        backend=BackendModel(median_latency=0.05, latency_sigma=1.0, error_rate=0.02,
+                             rate_limit_rate=0.05),
+    ),
+}
+
+
+def get_profile(name_or_path: str, sessions: Optional[int] = None,
+                duration: Optional[float] = None) -> WorkloadProfile:
+    """Resolve a built-in profile name or a profile JSON file.
+
+    Args:
+        name_or_path: Name of a built-in profile or path of a JSON profile
+        sessions: Optional override of the number of sessions
+        duration: Optional override of the duration
+
+    Returns:
+        The resolved profile
+
+    Raises:
+        ValueError: If the name is neither a built-in profile nor a readable file
+    """
+    if name_or_path in PROFILES:
+        profile = PROFILES[name_or_path].model_copy(deep=True)
+    else:
+        try:
+            profile = WorkloadProfile.load(name_or_path)
+        except OSError as e:
+            raise ValueError(f"Unknown profile {name_or_path}, choose one of {sorted(PROFILES)} "
+                             f"or pass a JSON file") from e
+
+    unknown: List[str] = [op for op in profile.operations if op not in OPERATIONS]
+    if unknown:
+        raise ValueError(f"Unknown operations in profile {profile.name}: {unknown}")
+    if sessions is not None:
+        profile.sessions = sessions
+    if duration is not None:
+        profile.duration = duration
+    return profile
@@ -0,0 +1,304 @@
+"""Load runner for the Agent C Session Manager.
+
+Drives ChatSessionRepo against the fake backend with a workload profile or a recorded trace
+and reports throughput, per-operation latency percentiles, event-loop lag and peak RSS.
+"""
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import BaseModel, Field
+
+from agent_c_session.loadgen.fake_backend import FakeZepBackend
+from agent_c_session.loadgen.profiles import TraceEvent, WorkloadProfile
+from agent_c_session.models.chat_session import ChatSession
+from agent_c_session.models.chat_user import ChatUser
+from agent_c_session.repositories.chat_session_repo import ChatSessionRepo
+from agent_c_session.repositories.request_scheduler import RequestScheduler
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+class LatencyStats(BaseModel):
+    """Latency distribution of one operation, in milliseconds.
+
+    Attributes:
+        count: Number of completed operations
+        errors: Number of operations that raised
+        p50: Median latency
+        p90: 90th percentile latency
+        p99: 99th percentile latency
+        max: Maximum latency
+    """
+
+    count: int = Field(0, description="Completed operations")
+    errors: int = Field(0, description="Operations that raised")
+    p50: float = Field(0.0, description="Median latency in ms")
+    p90: float = Field(0.0, description="90th percentile latency in ms")
+    p99: float = Field(0.0, description="99th percentile latency in ms")
+    max: float = Field(0.0, description="Maximum latency in ms")
+
+    @classmethod
+    def from_samples(cls, samples: List[float], errors: int = 0) -> "LatencyStats":
+        """Summarize latency samples.
+
+        Args:
+            samples: Latencies in seconds
+            errors: Number of failed operations
+
+        Returns:
+            The summarized statistics
+        """
+        if not samples:
+            return cls(errors=errors)
+
+        ordered = sorted(samples)
+
+        def percentile(fraction: float) -> float:
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+        return cls(count=len(ordered), errors=errors, p50=percentile(0.5), p90=percentile(0.9),
+                   p99=percentile(0.99), max=ordered[-1] * 1000)
+
+
+class LoadReport(BaseModel):
+    """Results of a load run, saved as JSON to compare runs.
+
+    Attributes:
+        profile: Name of the workload profile or trace
+        started_at: When the run started
+        duration: Wall clock length of the run in seconds
+        sessions: Number of simulated sessions
+        total_operations: Number of completed operations
+        throughput: Completed operations per second
+        operations: Latency statistics per operation
+        loop_lag: Event loop lag statistics
+        peak_rss_mb: Peak resident set size of the process in MiB, None if unavailable
+        backend_calls: Number of calls that reached the fake backend
+    """
+
+    profile: str = Field(..., description="Workload profile or trace name")
+    started_at: datetime = Field(default_factory=datetime.now, description="Start of the run")
+    duration: float = Field(0.0, description="Length of the run in seconds")
+    sessions: int = Field(0, description="Simulated sessions")
+    total_operations: int = Field(0, description="Completed operations")
+    throughput: float = Field(0.0, description="Completed operations per second")
+    operations: Dict[str, LatencyStats] = Field(default_factory=dict, description="Per-operation latency")
+    loop_lag: LatencyStats = Field(default_factory=LatencyStats, description="Event loop lag")
+    peak_rss_mb: Optional[float] = Field(None, description="Peak RSS in MiB")
+    backend_calls: int = Field(0, description="Calls that reached the fake backend")
+
+    def save(self, path: str) -> None:
+        """Write the report as JSON.
+
+        Args:
+            path: Path of the JSON file
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.model_dump_json(indent=2))
+
+    @classmethod
+    def load(cls, path: str) -> "LoadReport":
+        """Read a report written by `save`.
+
+        Args:
+            path: Path of the JSON file
+
+        Returns:
+            The loaded report
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.model_validate_json(f.read())
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Get the peak resident set size of the process.
+
+    Returns:
+        The peak RSS in MiB, None where the resource module is unavailable
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def compare_reports(baseline: LoadReport, current: LoadReport) -> List[str]:
+    """Describe how a run compares to a baseline run.
+
+    Args:
+        baseline: The reference run
+        current: The run to compare
+
+    Returns:
+        One human readable line per metric
+    """
+    def line(name: str, before: Optional[float], after: Optional[float]) -> str:
+        if before is None or after is None:
+            return f"{name}: {before} -> {after}"
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        return f"{name}: {before:.2f} -> {after:.2f} ({change})"
+
+    lines = [line("throughput ops/s", baseline.throughput, current.throughput),
+             line("loop lag p99 ms", baseline.loop_lag.p99, current.loop_lag.p99),
+             line("peak rss MiB", baseline.peak_rss_mb, current.peak_rss_mb)]
+    for op in sorted(set(baseline.operations) | set(current.operations)):
+        before = baseline.operations.get(op, LatencyStats())
+        after = current.operations.get(op, LatencyStats())
+        lines.append(line(f"{op} p50 ms", before.p50, after.p50))
+        lines.append(line(f"{op} p99 ms", before.p99, after.p99))
+        lines.append(f"{op} errors: {before.errors} -> {after.errors}")
+    return lines
+
+
+class LoadRunner:
+    """Replays a workload against ChatSessionRepo backed by a FakeZepBackend.
+
+    Attributes:
+        profile: The workload profile
+        backend: The fake backend the repo talks to
+        repo: The repository under test
+    """
+
+    def __init__(self, profile: WorkloadProfile, lag_interval: float = 0.05):
+        """Initialize the runner.
+
+        Args:
+            profile: The workload profile, also used for the backend model of trace replays
+            lag_interval: Sampling interval of the event loop lag monitor in seconds
+        """
+        self.profile = profile
+        self.lag_interval = lag_interval
+        self.backend = FakeZepBackend(profile.backend)
+        self.repo = ChatSessionRepo(zep_client=self.backend,  # type: ignore[arg-type]
+                                    scheduler=RequestScheduler(rate=profile.scheduler_rate))
+        self._random = random.Random(profile.backend.seed)
+        self._samples: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._lag: List[float] = []
+
+    async def _monitor_loop_lag(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self._lag.append(max(0.0, time.perf_counter() - start - self.lag_interval))
+
+    async def _execute(self, op: str, user_id: str, session: Optional[ChatSession]) -> Optional[ChatSession]:
+        start = time.perf_counter()
+        try:
+            if op == "new_session" or session is None:
+                op = "new_session"
+                session = await self.repo.new_session(user_id, title="load test")
+            elif op == "add_interaction":
+                session.add_interaction([{"role": "user" if i % 2 == 0 else "assistant",
+                                          "content": f"simulated message {i}"}
+                                         for i in range(self.profile.interaction_size)])
+            elif op == "add_tool_call":
+                session.add_tool_call({"tool_name": "search", "parameters": {"query": "load"},
+                                       "result": "ok"})
+            elif op == "set_managed_meta":
+                session.set_managed_meta("tool", f"search.key{self._random.randrange(20)}", time.time())
+            elif op == "get_messages":
+                session.get_messages(limit=10)
+            elif op == "get_user_session":
+                session = await self.repo.get_user_session(user_id, session.session_id)
+            elif op == "flush":
+                await self.repo.flush_session(session)
+            else:
+                raise ValueError(f"Unknown operation {op}")
+        except Exception:
+            self._errors[op] = self._errors.get(op, 0) + 1
+            return session
+
+        self._samples.setdefault(op, []).append(time.perf_counter() - start)
+        return session
+
+    async def _simulate_session(self, index: int, deadline: float) -> None:
+        profile = self.profile
+        user_id = f"user-{index % profile.users}"
+        ops = list(profile.operations)
+        weights = [profile.operations[op] for op in ops]
+
+        session = await self._execute("new_session", user_id, None)
+        while time.perf_counter() < deadline:
+            if profile.think_time > 0:
+                await asyncio.sleep(self._random.expovariate(1 / profile.think_time))
+            session = await self._execute(self._random.choices(ops, weights)[0], user_id, session)
+
+    async def _replay_trace(self, trace: Iterable[TraceEvent], start: float) -> None:
+        sessions: Dict[str, Optional[ChatSession]] = {}
+        locks: Dict[str, asyncio.Lock] = {}
+        tasks = set()
+
+        async def replay(event: TraceEvent) -> None:
+            async with locks.setdefault(event.session, asyncio.Lock()):
+                sessions[event.session] = await self._execute(event.op, event.user_id,
+                                                              sessions.get(event.session))
+
+        for event in trace:
+            delay = start + event.at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(replay(event))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+
+    def _seed_users(self, user_ids: Iterable[str]) -> None:
+        # Users are seeded straight into the backend so setup is not subject to the error model
+        for user_id in user_ids:
+            self.backend.users.setdefault(user_id, ChatUser(user_id=user_id).model_dump(exclude={"zep_user"}))
+
+    async def run(self, trace: Optional[Iterable[TraceEvent]] = None,
+                  trace_name: Optional[str] = None) -> LoadReport:
+        """Run the workload.
+
+        Args:
+            trace: Optional recorded trace to replay instead of the profile's random workload
+            trace_name: Name of the trace used in the report
+
+        Returns:
+            The report of the run
+        """
+        profile = self.profile
+        monitor = asyncio.create_task(self._monitor_loop_lag())
+        started_at = datetime.now()
+        start = time.perf_counter()
+        try:
+            if trace is not None:
+                events = list(trace)
+                self._seed_users({event.user_id for event in events})
+                start = time.perf_counter()
+                await self._replay_trace(events, start)
+            else:
+                self._seed_users(f"user-{i}" for i in range(profile.users))
+                start = time.perf_counter()
+                deadline = start + profile.duration
+                await asyncio.gather(*(self._simulate_session(i, deadline) for i in range(profile.sessions)))
+        finally:
+            monitor.cancel()
+        elapsed = time.perf_counter() - start
+
+        operations = {op: LatencyStats.from_samples(self._samples.get(op, []), self._errors.get(op, 0))
+                      for op in sorted(set(self._samples) | set(self._errors))}
+        total = sum(stats.count for stats in operations.values())
+        return LoadReport(
+            profile=trace_name or profile.name,
+            started_at=started_at,
+            duration=elapsed,
+            sessions=profile.sessions if trace is None else len({e.session for e in events}),
+            total_operations=total,
+            throughput=total / elapsed if elapsed else 0.0,
+            operations=operations,
+            loop_lag=LatencyStats.from_samples(self._lag),
+            peak_rss_mb=peak_rss_mb(),
+            backend_calls=self.backend.calls,
+        )
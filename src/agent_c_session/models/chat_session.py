@@ -3,22 +3,30 @@
 Provides an abstraction over the Zep memory API for chat sessions.
 """
 
-from typing import Any, Dict, List, Optional, Union
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+import zep_cloud.types as zep_types
 
 
 class ChatMessage(BaseModel):
     """Represents a single message in a chat session.
     
     Attributes:
+        message_id: Unique identifier for the message
         role: The role of the message sender (user, assistant, system, etc.)
+        role_type: The kind of role (user, assistant, ...) when `role` is a name, e.g. "John Doe"
         content: The content of the message
         timestamp: When the message was created
         metadata: Additional message metadata
     """
     
+    message_id: str = Field(default_factory=lambda: uuid.uuid4().hex, description="Message identifier")
     role: str = Field(..., description="Role of the message sender")
+    role_type: Optional[str] = Field(None, description="Kind of role when role is a name")
     content: str = Field(..., description="Content of the message")
     timestamp: datetime = Field(default_factory=datetime.now, description="Message timestamp")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Message metadata")
@@ -56,6 +64,12 @@ class ChatSession(BaseModel):
         updated_at: When the session was last updated
         metadata: General session metadata
         managed_metadata: Structured metadata with controlled access
+        metadata_written_at: Unix time of the last write of each general metadata key
+        managed_metadata_written_at: Unix time of the last write of each managed metadata key
+        
+    Messages and tool calls are kept in an in-memory log. Entries added since the last
+    flush are tracked as pending until `mark_flushed` is called. Changes are reported to the
+    observer registered with `observe`, which is how the repository emits change events.
     """
     
     session_id: str = Field(..., description="Unique identifier for the session")
@@ -66,6 +80,79 @@ class ChatSession(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="General session metadata")
     managed_metadata: Dict[str, str] = Field(default_factory=dict, 
                                            description="Structured metadata with controlled access")
+    metadata_written_at: Dict[str, float] = Field(default_factory=dict,
+                                                  description="Last write time of each metadata key")
+    managed_metadata_written_at: Dict[str, float] = Field(default_factory=dict,
+                                                          description="Last write time of each managed metadata key")
+    _messages: List[ChatMessage] = PrivateAttr(default_factory=list)
+    _tool_calls: List[ToolCall] = PrivateAttr(default_factory=list)
+    _flushed_messages: int = PrivateAttr(0)
+    _observer: Optional[Callable[["ChatSession", str, Dict[str, Any]], None]] = PrivateAttr(None)
+    
+    @classmethod
+    def from_zep(cls, zep_session: zep_types.Session) -> "ChatSession":
+        """Create a ChatSession instance from a Zep session object.
+        
+        The title and managed metadata are stored inside the Zep session metadata,
+        see `to_zep_metadata`.
+        
+        Args:
+            zep_session: Zep session object
+            
+        Returns:
+            ChatSession instance
+        """
+        metadata = dict(zep_session.metadata or {})
+        title = metadata.pop("title", None)
+        managed_metadata = metadata.pop("managed_metadata", None) or {}
+        metadata_written_at = metadata.pop("metadata_written_at", None) or {}
+        managed_metadata_written_at = metadata.pop("managed_metadata_written_at", None) or {}
+        timestamps = {key: value for key, value in (("created_at", zep_session.created_at),
+                                                     ("updated_at", zep_session.updated_at)) if value}
+        return cls(
+            session_id=zep_session.session_id,
+            user_id=zep_session.user_id,
+            title=title,
+            metadata=metadata,
+            managed_metadata=managed_metadata,
+            metadata_written_at=metadata_written_at,
+            managed_metadata_written_at=managed_metadata_written_at,
+            **timestamps
+        )
+    
+    def to_zep_metadata(self) -> Dict[str, Any]:
+        """Build the metadata dict stored on the Zep session.
+        
+        Returns:
+            The general metadata with the title, the managed metadata and the write times folded in
+        """
+        metadata = dict(self.metadata)
+        if self.title is not None:
+            metadata["title"] = self.title
+        if self.managed_metadata:
+            metadata["managed_metadata"] = dict(self.managed_metadata)
+        if self.metadata_written_at:
+            metadata["metadata_written_at"] = dict(self.metadata_written_at)
+        if self.managed_metadata_written_at:
+            metadata["managed_metadata_written_at"] = dict(self.managed_metadata_written_at)
+        return metadata
+    
+    def observe(self, observer: Optional[Callable[["ChatSession", str, Dict[str, Any]], Any]]) -> None:
+        """Register the callback notified of changes to this session.
+        
+        The callback receives the session, the change type (`messages_added`,
+        `metadata_changed`, `tool_call_added`, `flush` or `flush_sync`) and a payload dict.
+        What it returns for `flush` is returned by `flush`.
+        
+        Args:
+            observer: The callback, or None to stop observing
+        """
+        self._observer = observer
+    
+    def _notify(self, change: str, payload: Dict[str, Any]) -> Any:
+        if self._observer is not None:
+            return self._observer(self, change, payload)
+        return None
     
     def add_message(self, message: Union[ChatMessage, Dict[str, Any]]) -> None:
         """Add a message to the chat session.
@@ -73,8 +160,11 @@ class ChatSession(BaseModel):
         Args:
             message: The message to add (either a ChatMessage object or a dict)
         """
-        # Implementation to be added
-        pass
+        if isinstance(message, dict):
+            message = ChatMessage(**message)
+        self._messages.append(message)
+        self.updated_at = datetime.now()
+        self._notify("messages_added", {"messages": [message.model_dump(mode="json")], "flushed": False})
     
     def add_interaction(self, messages: List[Union[ChatMessage, Dict[str, Any]]]) -> None:
         """Add multiple messages as a single interaction to the chat session.
@@ -82,8 +172,11 @@ class ChatSession(BaseModel):
         Args:
             messages: List of messages to add
         """
-        # Implementation to be added
-        pass
+        converted = [ChatMessage(**m) if isinstance(m, dict) else m for m in messages]
+        self._messages.extend(converted)
+        self.updated_at = datetime.now()
+        self._notify("messages_added", {"messages": [m.model_dump(mode="json") for m in converted],
+                                        "flushed": False})
     
     def add_tool_call(self, tool_call: Union[ToolCall, Dict[str, Any]]) -> None:
         """Add a tool call to the chat session.
@@ -91,8 +184,33 @@ class ChatSession(BaseModel):
         Args:
             tool_call: The tool call to add (either a ToolCall object or a dict)
         """
-        # Implementation to be added
-        pass
+        if isinstance(tool_call, dict):
+            tool_call = ToolCall(**tool_call)
+        self._tool_calls.append(tool_call)
+        self.updated_at = datetime.now()
+        self._notify("tool_call_added", {"tool_name": tool_call.tool_name})
+    
+    def drop_tool_calls(self, keep_last: int) -> int:
+        """Drop the oldest tool calls, keeping only the most recent ones.
+        
+        Args:
+            keep_last: Number of most recent tool calls to keep
+            
+        Returns:
+            Number of tool calls dropped
+        """
+        dropped = max(0, len(self._tool_calls) - keep_last)
+        if dropped:
+            del self._tool_calls[:dropped]
+        return dropped
+    
+    def get_tool_calls(self) -> List[ToolCall]:
+        """Get the tool calls recorded for the chat session.
+        
+        Returns:
+            List of ToolCall objects, oldest first
+        """
+        return list(self._tool_calls)
     
     def get_messages(self, limit: int = 10, before_id: Optional[str] = None) -> List[ChatMessage]:
         """Get recent messages from the chat session.
@@ -104,8 +222,66 @@ class ChatSession(BaseModel):
         Returns:
             List of ChatMessage objects
         """
-        # Implementation to be added
-        pass
+        end = len(self._messages)
+        if before_id is not None:
+            end = next((i for i, m in enumerate(self._messages) if m.message_id == before_id), end)
+        return self._messages[max(0, end - limit):end]
+    
+    def get_oldest_message(self) -> Optional[ChatMessage]:
+        """Get the oldest message held in memory.
+        
+        Returns:
+            The oldest ChatMessage, or None if the session holds no messages
+        """
+        return self._messages[0] if self._messages else None
+    
+    def get_pending_messages(self) -> List[ChatMessage]:
+        """Get the messages added since the last flush.
+        
+        Returns:
+            List of ChatMessage objects not yet written to the underlying storage
+        """
+        return self._messages[self._flushed_messages:]
+    
+    def mark_flushed(self, count: Optional[int] = None) -> None:
+        """Mark pending messages as written to the underlying storage.
+        
+        Args:
+            count: Number of pending messages, oldest first, that were written. All if None.
+        """
+        if count is None:
+            self._flushed_messages = len(self._messages)
+        else:
+            self._flushed_messages = min(len(self._messages), self._flushed_messages + count)
+    
+    def drop_messages_before(self, cutoff: datetime) -> int:
+        """Drop flushed messages older than a cutoff from the in-memory log.
+        
+        Pending messages are never dropped, so nothing is lost before it reaches storage.
+        
+        Args:
+            cutoff: Messages with an earlier timestamp are dropped
+            
+        Returns:
+            Number of messages dropped
+        """
+        threshold = cutoff.timestamp()
+        dropped = 0
+        while dropped < self._flushed_messages and self._messages[dropped].timestamp.timestamp() < threshold:
+            dropped += 1
+        if dropped:
+            del self._messages[:dropped]
+            self._flushed_messages -= dropped
+        return dropped
+    
+    def load_messages(self, messages: List[ChatMessage]) -> None:
+        """Replace the message log with messages already held by the underlying storage.
+        
+        Args:
+            messages: Stored messages, oldest first
+        """
+        self._messages = list(messages)
+        self._flushed_messages = len(self._messages)
     
     def get_meta(self, key: str, default: Any = None) -> Any:
         """Get a value from the session metadata.
@@ -127,7 +303,25 @@ class ChatSession(BaseModel):
             value: Value to store
         """
         self.metadata[key] = value
+        self.metadata_written_at[key] = time.time()
         self.updated_at = datetime.now()
+        self._notify("metadata_changed", {"key": key})
+    
+    def delete_meta(self, key: str) -> bool:
+        """Remove a value from the session metadata.
+        
+        Args:
+            key: Metadata key
+            
+        Returns:
+            True if the key existed
+        """
+        if self.metadata.pop(key, None) is None:
+            return False
+        self.metadata_written_at.pop(key, None)
+        self.updated_at = datetime.now()
+        self._notify("metadata_changed", {"key": key, "deleted": True})
+        return True
     
     def get_managed_meta(self, namespace: str, key: str, default: Any = None) -> Any:
         """Get a value from the managed metadata under a namespace.
@@ -140,8 +334,8 @@ class ChatSession(BaseModel):
         Returns:
             Value associated with the namespace and key, or default
         """
-        # Implementation to be added
-        pass
+        value = self.managed_metadata.get(f"{namespace}.{key}")
+        return default if value is None else json.loads(value)
     
     def set_managed_meta(self, namespace: str, key: str, value: Any) -> None:
         """Set a value in the managed metadata under a namespace.
@@ -151,10 +345,90 @@ class ChatSession(BaseModel):
             key: Metadata key within the namespace
             value: Value to store
         """
-        # Implementation to be added
-        pass
+        self.managed_metadata[f"{namespace}.{key}"] = json.dumps(value, default=str)
+        self.managed_metadata_written_at[f"{namespace}.{key}"] = time.time()
+        self.updated_at = datetime.now()
+        self._notify("metadata_changed", {"namespace": namespace, "key": key})
+    
+    def delete_managed_meta(self, namespace: str, key: str) -> bool:
+        """Remove a value from the managed metadata under a namespace.
+        
+        Args:
+            namespace: Metadata namespace (e.g., 'tool', 'application')
+            key: Metadata key within the namespace
+            
+        Returns:
+            True if the key existed
+        """
+        if self.managed_metadata.pop(f"{namespace}.{key}", None) is None:
+            return False
+        self.managed_metadata_written_at.pop(f"{namespace}.{key}", None)
+        self.updated_at = datetime.now()
+        self._notify("metadata_changed", {"namespace": namespace, "key": key, "deleted": True})
+        return True
+    
+    def to_snapshot(self) -> bytes:
+        """Serialize the session, including its message and tool call logs.
+        
+        Returns:
+            The serialized session
+        """
+        return json.dumps({
+            "session": self.model_dump(mode="json"),
+            "messages": [m.model_dump(mode="json") for m in self._messages],
+            "tool_calls": [t.model_dump(mode="json") for t in self._tool_calls],
+            "flushed_messages": self._flushed_messages,
+        }, default=str).encode("utf-8")
+    
+    @classmethod
+    def from_snapshot(cls, data: bytes) -> "ChatSession":
+        """Rebuild a session serialized with `to_snapshot`.
+        
+        Args:
+            data: The serialized session
+            
+        Returns:
+            ChatSession instance
+        """
+        state = json.loads(data)
+        session = cls(**state["session"])
+        session._messages = [ChatMessage(**m) for m in state["messages"]]
+        session._tool_calls = [ToolCall(**t) for t in state["tool_calls"]]
+        session._flushed_messages = state["flushed_messages"]
+        return session
     
-    def flush(self) -> None:
-        """Flush all pending changes to the underlying storage."""
-        # Implementation to be added
-        pass
\ No newline at end of file
+    def flush(self) -> Awaitable[None]:
+        """Flush all pending changes to the underlying storage.
+        
+        The write is performed in the background by the repository observing the session and
+        the returned awaitable completes with it. Use `flush_sync` from other threads.
+        
+        Returns:
+            An awaitable for the write
+            
+        Raises:
+            RuntimeError: If the session is not attached to a repository or the call is not
+                          made on the repository's event loop
+        """
+        if self._observer is None:
+            raise RuntimeError(f"ChatSession {self.session_id} is not attached to a repository")
+        return self._notify("flush", {})
+    
+    def flush_sync(self, timeout: Optional[float] = None) -> None:
+        """Flush all pending changes and block until they are written.
+        
+        For threads other than the repository's event loop, e.g. callers of the sync facade.
+        
+        Args:
+            timeout: Seconds to wait before the write is cancelled, defaults to the
+                     repository's `sync_timeout`
+            
+        Raises:
+            RuntimeError: If the session is not attached to a repository or the call is made
+                          on the repository's event loop
+            TimeoutError: If the write does not complete within the timeout
+            Exception: The error of the write
+        """
+        if self._observer is None:
+            raise RuntimeError(f"ChatSession {self.session_id} is not attached to a repository")
+        self._notify("flush_sync", {"timeout": timeout})
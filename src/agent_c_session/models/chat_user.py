@@ -3,10 +3,14 @@
 Provides an abstraction over the Zep user object with additional metadata management.
 """
 
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from pydantic import BaseModel, Field, PrivateAttr
 import zep_cloud.types as zep_types
 
+if TYPE_CHECKING:
+    from agent_c_session.models.chat_session import ChatSession
+    from agent_c_session.repositories.sync_chat_session_repo import SyncChatSessionRepo
+
 class ChatUser(BaseModel):
     """Represents a chat user in the Agent C system.
     
@@ -28,6 +32,7 @@ class ChatUser(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="General user metadata")
     last_name: Optional[str] = Field(None, description="User's last name")
     zep_user: Optional[zep_types.User] = Field(None, description="Zep user object")
+    _repo: Optional["SyncChatSessionRepo"] = PrivateAttr(None)
 
     @classmethod
     def from_zep(cls, zep_user: zep_types.User) -> "ChatUser":
@@ -47,6 +52,19 @@ class ChatUser(BaseModel):
             metadata=zep_user.metadata or {},
             zep_user=zep_user
         )
+
+    def bind_repo(self, repo: "SyncChatSessionRepo") -> None:
+        """Bind this user to the synchronous repository used by its session methods.
+        
+        Args:
+            repo: The synchronous repository to route session lookups through
+        """
+        self._repo = repo
+
+    def _require_repo(self) -> "SyncChatSessionRepo":
+        if self._repo is None:
+            raise RuntimeError(f"ChatUser {self.user_id} is not bound to a SyncChatSessionRepo")
+        return self._repo
     
     def get_sessions(self, limit: int = 10, offset: int = 0) -> List["ChatSession"]:
         """Return a list of chat sessions for this user.
@@ -57,9 +75,11 @@ class ChatUser(BaseModel):
             
         Returns:
             List of ChatSession objects belonging to this user
+            
+        Raises:
+            RuntimeError: If the user is not bound to a SyncChatSessionRepo
         """
-        # Implementation to be added
-        pass
+        return self._require_repo().get_user_sessions(self.user_id, limit, offset)
     
     def search_sessions(self, query: str, limit: int = 10) -> List["ChatSession"]:
         """Search for chat sessions using the Zep search API.
@@ -70,9 +90,11 @@ class ChatUser(BaseModel):
             
         Returns:
             List of ChatSession objects matching the search criteria
+            
+        Raises:
+            RuntimeError: If the user is not bound to a SyncChatSessionRepo
         """
-        # Implementation to be added
-        pass
+        return self._require_repo().search_user_sessions(self.user_id, query, limit)
     
     def get_meta(self, key: str, default: Any = None) -> Any:
         """Get a value from the user metadata.
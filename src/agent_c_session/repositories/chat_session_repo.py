@@ -2,16 +2,31 @@
 
 Provides methods for managing chat users and sessions with Zep Cloud as the backend.
 """
+import asyncio
 import os
-from typing import Any, Dict, List, Optional, Union
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+from agent_c_session.adapters.base_adapter import BaseAdapter
+from agent_c_session.adapters.zep_adapter import ZepAdapter
 from agent_c_session.models.chat_user import ChatUser
-from agent_c_session.models.chat_session import ChatSession
+from agent_c_session.models.chat_session import ChatMessage, ChatSession
+from agent_c_session.repositories.request_scheduler import RequestPriority, RequestScheduler
+from agent_c_session.repositories.retention import RetentionSweeper
+from agent_c_session.repositories.session_events import SessionEvent, SessionEventBus, SessionEventType
+from agent_c_session.repositories.tiered_session_store import TieredSessionStore
+from agent_c_session.repositories.session_archive import (ArchiveCheckpoint, ArchiveFormat, create_writer,
+                                                          message_from_record, message_record,
+                                                          read_records, session_from_record,
+                                                          session_record)
 from zep_cloud.client import AsyncZep
-from zep_cloud.errors import NotFoundError, InternalServerError, BadRequestError, UnauthorizedError
+from zep_cloud.errors import (NotFoundError, InternalServerError, BadRequestError, UnauthorizedError,
+                              ConflictError)
 from agent_c.util.slugs import MnemonicSlugs
 
 import zep_cloud.types as zep_types
 
+T = TypeVar("T")
+
 
 class ChatSessionRepo:
     """Repository for managing chat users and sessions.
@@ -21,21 +36,237 @@ class ChatSessionRepo:
     
     Attributes:
         zep_client: Client for interacting with Zep Cloud API
+        scheduler: Rate-limit aware scheduler all upstream calls are routed through
+        adapter: Adapter translating between Agent C and Zep message formats
+        session_store: Local hot and warm tiers in front of Zep for `get_user_session`
+        message_window: Number of recent messages loaded when a session comes from Zep
+        events: Change feed fired by the repo mutators and the sessions it hands out
+        retention: Optional sweeper enforcing retention limits on the sessions the repo hands out
+        sync_timeout: Default seconds `ChatSession.flush_sync` waits for the write, None waits forever
     """
     
-    def __init__(self, zep_client: Optional[AsyncZep] = None, zep_api_key: Optional[str] = None):
+    def __init__(self, zep_client: Optional[AsyncZep] = None, zep_api_key: Optional[str] = None,
+                 scheduler: Optional[RequestScheduler] = None, adapter: Optional[BaseAdapter] = None,
+                 session_store: Optional[TieredSessionStore] = None, message_window: int = 100,
+                 event_bus: Optional[SessionEventBus] = None, retention: Optional[RetentionSweeper] = None,
+                 sync_timeout: Optional[float] = None):
         """Initialize the chat session repository.
         
         Args:
             zep_client: A zep client instance for interacting with Zep Cloud API
             zep_api_key: API key for authenticating with Zep Cloud if not client provided
                          Will be pulled from ZEP_API_KEY env variable if not provided
+            scheduler: Scheduler for upstream calls, a default one is created if not provided.
+                       Share one instance between repos that use the same Zep account and event
+                       loop, a scheduler is bound to the loop it is first used on. A client
+                       passed in should use `scheduler.create_httpx_client()` so the scheduler
+                       sees the rate limit headers.
+            adapter: Message format adapter, defaults to ZepAdapter
+            session_store: Local session tiers, defaults to a hot-only TieredSessionStore
+            message_window: Number of recent messages loaded when a session comes from Zep
+            event_bus: Change feed to emit events on, a new one is created if not provided
+            retention: Sweeper enforcing retention limits, sessions are unbounded if not provided.
+                       Its background sweeps start with the first session the repo hands out.
+                       Metadata it removes is written back to Zep, so use one sweeper per repo.
+            sync_timeout: Default seconds `ChatSession.flush_sync` waits for the write before it
+                          is cancelled, None waits forever
         """
+        self.scheduler = scheduler or RequestScheduler()
         if not zep_client:
             api_key = zep_api_key or os.getenv("ZEP_API_KEY")
-            zep_client = AsyncZep(api_key=api_key)
+            # Same 60s timeout the SDK applies to the client it creates itself
+            zep_client = AsyncZep(api_key=api_key, timeout=60,
+                                  httpx_client=self.scheduler.create_httpx_client(timeout=60))
 
         self.zep_client = zep_client
+        self.adapter = adapter or ZepAdapter()
+        self.session_store = session_store or TieredSessionStore()
+        self.message_window = message_window
+        self.events = event_bus or SessionEventBus()
+        self.retention = retention
+        self.sync_timeout = sync_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._flush_tasks: set = set()
+        # Pending metadata write-back per session after retention removed keys
+        self._metadata_writes: Dict[str, asyncio.Task] = {}
+        if retention is not None:
+            retention.observe(self._on_retention_evict)
+
+    async def _call(self, user_id: Optional[str], fn: Callable[..., Awaitable[T]], /, *args: Any,
+                    **kwargs: Any) -> T:
+        """Route an upstream call through the scheduler.
+        
+        The SDK's own retries are disabled so rate limited calls are retried by the scheduler.
+        
+        Args:
+            user_id: ID of the user the call is made on behalf of, used for fair queuing
+            fn: Zep client coroutine function to call
+            *args: Positional arguments for the call
+            **kwargs: Keyword arguments for the call
+            
+        Returns:
+            The result of the upstream call
+        """
+        kwargs.setdefault("request_options", {"max_retries": 0})
+        return await self.scheduler.run(lambda: fn(*args, **kwargs), user_id=user_id)
+
+    def _emit(self, event_type: SessionEventType, user_id: str, session_id: Optional[str] = None,
+              **payload: Any) -> None:
+        self.events.emit(SessionEvent(event_type=event_type, user_id=user_id, session_id=session_id,
+                                      payload=payload))
+
+    def _track(self, session: ChatSession) -> ChatSession:
+        """Attach the repo to a session so its changes are emitted and flushes are persisted.
+        
+        Args:
+            session: The session handed out by the repo
+            
+        Returns:
+            The same session
+        """
+        self._loop = asyncio.get_running_loop()
+        session.observe(self._on_session_change)
+        if self.retention is not None:
+            self.retention.watch(session)
+            self.retention.start()
+        return session
+
+    def _on_session_change(self, session: ChatSession, change: str,
+                           payload: Dict[str, Any]) -> Optional[Awaitable[None]]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if change == "flush":
+            if loop is None or loop is not self._loop:
+                raise RuntimeError("ChatSession.flush must be called on the repository's event loop, "
+                                   "use flush_sync from other threads")
+            task = loop.create_task(self.flush_session(session))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._on_flush_done)
+            return task
+
+        if change == "flush_sync":
+            if loop is not None and loop is self._loop:
+                raise RuntimeError("ChatSession.flush_sync would block the repository's event loop, "
+                                   "await flush instead")
+            if self._loop is None or not self._loop.is_running():
+                raise RuntimeError("ChatSession.flush_sync requires the repository's event loop to be running")
+            future = asyncio.run_coroutine_threadsafe(self.flush_session(session), self._loop)
+            timeout = payload["timeout"] if payload["timeout"] is not None else self.sync_timeout
+            try:
+                future.result(timeout)
+            except TimeoutError:
+                future.cancel()
+                raise
+            return None
+
+        if change != "tool_call_added":
+            self._emit(SessionEventType(change), session.user_id, session.session_id, **payload)
+        if loop is None and self._loop is not None and self._loop.is_running():
+            # Changed from a caller thread of the sync facade: the store and the retention
+            # sweeper are only touched on the event loop
+            self._loop.call_soon_threadsafe(self._apply_session_change, session, change, payload)
+        else:
+            self._apply_session_change(session, change, payload)
+        return None
+
+    def _apply_session_change(self, session: ChatSession, change: str, payload: Dict[str, Any]) -> None:
+        self.session_store.touch(session)
+        if self.retention is not None:
+            self.retention.on_change(session, change, payload)
+
+    def _on_retention_evict(self, session: ChatSession) -> None:
+        # The sweeper runs on the event loop; one pending write covers every removal before it starts
+        if session.session_id in self._metadata_writes or self._loop is None or self._loop.is_closed():
+            return
+
+        with self.scheduler.priority(RequestPriority.BACKGROUND):
+            task = self._loop.create_task(self._write_metadata(session))
+        self._metadata_writes[session.session_id] = task
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._on_flush_done)
+
+    async def _write_metadata(self, session: ChatSession) -> None:
+        """Write a session's metadata to Zep after the retention sweeper removed keys.
+        
+        Args:
+            session: The session whose metadata changed
+        """
+        try:
+            async with self._flush_lock(session.session_id):
+                # Removals from here on need another write
+                self._metadata_writes.pop(session.session_id, None)
+                await self._call(session.user_id, self.zep_client.memory.update_session, session.session_id,
+                                 metadata=session.to_zep_metadata())
+        finally:
+            if self._metadata_writes.get(session.session_id) is asyncio.current_task():
+                del self._metadata_writes[session.session_id]
+
+    def _flush_lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._flush_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._flush_locks[session_id] = lock
+        return lock
+
+    def _on_flush_done(self, task: "asyncio.Task[None]") -> None:
+        # Failed flushes stay tracked until wait_for_flushes surfaces their error
+        if task.cancelled() or task.exception() is None:
+            self._flush_tasks.discard(task)
+
+    async def wait_for_flushes(self) -> None:
+        """Wait for the flushes started by `ChatSession.flush` on the event loop.
+        
+        Raises:
+            Exception: The error of the first flush that failed since the last call
+        """
+        errors = []
+        while self._flush_tasks:
+            tasks = list(self._flush_tasks)
+            self._flush_tasks.difference_update(tasks)
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            errors.extend(r for r in results if isinstance(r, Exception))
+        if errors:
+            raise errors[0]
+
+    async def close(self) -> None:
+        """Stop the background retention sweeps and wait for pending flushes.
+        
+        Raises:
+            Exception: The error of the first flush that failed and was not waited for
+        """
+        if self.retention is not None:
+            self.retention.stop()
+        await self.wait_for_flushes()
+
+    async def flush_session(self, session: ChatSession) -> None:
+        """Write a session's pending messages and its metadata to Zep.
+        
+        Flushes of the same session are serialized. The session is written through to the
+        local tiers afterwards. Emits `messages_added` with `flushed=True` for the messages written.
+        
+        Args:
+            session: The session to flush
+        """
+        async with self._flush_lock(session.session_id):
+            pending = session.get_pending_messages()
+            if pending:
+                messages = self.adapter.to_external_format([m.model_dump() for m in pending])
+                await self._call(session.user_id, self.zep_client.memory.add, session.session_id,
+                                 messages=[zep_types.Message(**m) for m in messages])
+                session.mark_flushed(len(pending))
+
+            await self._call(session.user_id, self.zep_client.memory.update_session, session.session_id,
+                             metadata=session.to_zep_metadata())
+            # Re-measure the session and make the flushed object the copy the local tiers serve
+            self.session_store.put(session)
+
+        if pending:
+            self._emit(SessionEventType.MESSAGES_ADDED, session.user_id, session.session_id,
+                       messages=[m.model_dump(mode="json") for m in pending], flushed=True)
     
     async def add_chat_user(self, user: ChatUser) -> ChatUser:
         """Add a new chat user.
@@ -50,7 +281,8 @@ class ChatSessionRepo:
         Raises:
             ValueError: If a user with the same username already exists
         """
-        user.zep_user = await self.zep_client.user.add(**user.model_dump())
+        user.zep_user = await self._call(user.user_id, self.zep_client.user.add, **user.model_dump())
+        self._emit(SessionEventType.USER_UPDATED, user.user_id, action="created")
 
         return user
 
@@ -67,8 +299,10 @@ class ChatSessionRepo:
         Raises:
             ValueError: If the user doesn't exist
         """
-        user.zep_user = await self.zep_client.user.update(first_name=user.first_name, last_name=user.last_name,
-                                                           email=user.email, user_id=user.user_id)
+        user.zep_user = await self._call(user.user_id, self.zep_client.user.update,
+                                         first_name=user.first_name, last_name=user.last_name,
+                                         email=user.email, user_id=user.user_id)
+        self._emit(SessionEventType.USER_UPDATED, user.user_id, action="updated")
         return user
     
     async def delete_chat_user(self, user_id: str) -> None:
@@ -80,7 +314,8 @@ class ChatSessionRepo:
         Raises:
             ValueError: If the user doesn't exist
         """
-        await self.zep_client.user.delete(user_id=user_id)
+        await self._call(user_id, self.zep_client.user.delete, user_id=user_id)
+        self._emit(SessionEventType.USER_UPDATED, user_id, action="deleted")
     
     async def get_chat_user(self, user_id: str) -> ChatUser:
         """Get a chat user by user_id.
@@ -94,7 +329,7 @@ class ChatSessionRepo:
         Raises:
             ValueError: If the user doesn't exist
         """
-        return ChatUser.from_zep(await self.zep_client.user.get(user_id=user_id))
+        return ChatUser.from_zep(await self._call(user_id, self.zep_client.user.get, user_id=user_id))
     
     async def get_user_sessions(self, username: str, limit: int = 10, offset: int = 0) -> List[ChatSession]:
         """Get chat sessions for a user.
@@ -110,12 +345,19 @@ class ChatSessionRepo:
         Raises:
             ValueError: If the user doesn't exist
         """
-        # Implementation to be added
-        pass
+        try:
+            zep_sessions = await self._call(username, self.zep_client.user.get_sessions, username)
+        except NotFoundError as e:
+            raise ValueError(f"User {username} does not exist") from e
+
+        return list(await asyncio.gather(*(self._get_session(username, zep_session.session_id, zep_session)
+                                           for zep_session in zep_sessions[offset:offset + limit])))
     
     async def search_user_sessions(self, username: str, query: str, limit: int = 10) -> List[ChatSession]:
         """Search for chat sessions for a user.
         
+        Sessions are ranked by the best scoring message Zep finds for the query.
+        
         Args:
             username: Username of the user
             query: Search query string
@@ -127,8 +369,48 @@ class ChatSessionRepo:
         Raises:
             ValueError: If the user doesn't exist
         """
-        # Implementation to be added
-        pass
+        session_ids = await self._search_session_ids(username, query, limit)
+        return list(await asyncio.gather(*(self.get_user_session(username, session_id)
+                                           for session_id in session_ids)))
+    
+    async def _search_session_ids(self, username: str, query: str, limit: int) -> List[str]:
+        """Find the IDs of the sessions that best match a query.
+        
+        Search results are per message, so several can belong to the same session. Zep has no
+        offset for session search, so the result window is doubled until it holds `limit`
+        distinct sessions or Zep runs out of results.
+        
+        Args:
+            username: Username of the user
+            query: Search query string
+            limit: Maximum number of session IDs to return
+            
+        Returns:
+            Session IDs, best match first
+            
+        Raises:
+            ValueError: If the user doesn't exist
+        """
+        if limit <= 0:
+            return []
+
+        window = limit
+        while True:
+            try:
+                response = await self._call(username, self.zep_client.memory.search_sessions, text=query,
+                                            user_id=username, limit=window)
+            except NotFoundError as e:
+                raise ValueError(f"User {username} does not exist") from e
+
+            results = response.results or []
+            session_ids: List[str] = []
+            for result in sorted(results, key=lambda r: r.score or 0.0, reverse=True):
+                if result.session_id and result.session_id not in session_ids:
+                    session_ids.append(result.session_id)
+
+            if len(session_ids) >= limit or len(results) < window:
+                return session_ids[:limit]
+            window *= 2
     
     async def get_user_session(self, username: str, session_id: str) -> ChatSession:
         """Get a specific chat session for a user.
@@ -143,8 +425,64 @@ class ChatSessionRepo:
         Raises:
             ValueError: If the user or session doesn't exist
         """
-        # Implementation to be added
-        pass
+        return await self._get_session(username, session_id)
+
+    async def _get_session(self, username: str, session_id: str,
+                           zep_session: Optional[zep_types.Session] = None) -> ChatSession:
+        """Get the live session for an ID from the local tiers, loading it from Zep on a miss.
+        
+        Every lookup of a session returns the same object while it is in use, so changes made
+        through one reference are never lost to another.
+        
+        Args:
+            username: Username of the user
+            session_id: ID of the session to retrieve
+            zep_session: The Zep session when the caller already fetched it
+            
+        Returns:
+            The requested ChatSession
+            
+        Raises:
+            ValueError: If the session doesn't exist or belongs to another user
+        """
+        session = self.session_store.get(session_id)
+        if session is None:
+            # A concurrent load of the same session may have been stored first
+            session = self.session_store.put(await self._load_session(username, session_id, zep_session))
+
+        if session.user_id != username:
+            raise ValueError(f"Session {session_id} does not belong to user {username}")
+        return self._track(session)
+
+    async def _load_session(self, username: str, session_id: str,
+                            zep_session: Optional[zep_types.Session] = None) -> ChatSession:
+        """Load a session and its most recent messages from Zep.
+        
+        Args:
+            username: Username of the user, used for fair queuing
+            session_id: ID of the session to load
+            zep_session: The Zep session when the caller already fetched it
+            
+        Returns:
+            The loaded ChatSession
+            
+        Raises:
+            ValueError: If the session doesn't exist
+        """
+        try:
+            if zep_session is None:
+                zep_session = await self._call(username, self.zep_client.memory.get_session, session_id)
+            memory = await self._call(username, self.zep_client.memory.get, session_id,
+                                      lastn=self.message_window)
+        except NotFoundError as e:
+            self.session_store.record_cold(False)
+            raise ValueError(f"Session {session_id} does not exist") from e
+
+        self.session_store.record_cold(True)
+        session = ChatSession.from_zep(zep_session)
+        messages = self.adapter.to_application_format([m.dict() for m in memory.messages or []])
+        session.load_messages([ChatMessage(**m) for m in messages])
+        return session
     
     async def remove_user_session(self, username: str, session_id: str) -> None:
         """Remove a chat session for a user.
@@ -156,8 +494,12 @@ class ChatSessionRepo:
         Raises:
             ValueError: If the user or session doesn't exist
         """
-        # Implementation to be added
-        pass
+        self.session_store.invalidate(session_id)
+        try:
+            await self._call(username, self.zep_client.memory.delete, session_id)
+        except NotFoundError as e:
+            raise ValueError(f"Session {session_id} does not exist") from e
+        self._emit(SessionEventType.SESSION_REMOVED, username, session_id)
     
     async def new_session(self, username: str, title: Optional[str] = None, 
                          initial_metadata: Optional[Dict[str, Any]] = None) -> ChatSession:
@@ -174,5 +516,290 @@ class ChatSessionRepo:
         Raises:
             ValueError: If the user doesn't exist
         """
-        # Implementation to be added
-        pass
\ No newline at end of file
+        session = ChatSession(session_id=MnemonicSlugs.generate_slug(3), user_id=username, title=title,
+                              metadata=dict(initial_metadata or {}))
+        try:
+            await self._call(username, self.zep_client.memory.add_session, session_id=session.session_id,
+                             user_id=username, metadata=session.to_zep_metadata())
+        except NotFoundError as e:
+            raise ValueError(f"User {username} does not exist") from e
+
+        self.session_store.put(session)
+        self._emit(SessionEventType.SESSION_CREATED, username, session.session_id, title=title)
+        return self._track(session)
+
+    async def _fetch_session_messages(self, session: ChatSession, pages: asyncio.Queue,
+                                      page_size: int) -> None:
+        """Fetch the messages of a session page by page into a bounded queue.
+        
+        Pages are converted to the application format. The queue receives None once all pages
+        have been fetched, or the exception that stopped the fetch.
+        
+        Args:
+            session: The session to fetch messages for
+            pages: Bounded queue receiving the converted pages
+            page_size: Number of messages fetched per upstream call
+        """
+        try:
+            cursor = 1
+            fetched = 0
+            while True:
+                response = await self._call(session.user_id, self.zep_client.memory.get_session_messages,
+                                            session.session_id, limit=page_size, cursor=cursor)
+                messages = response.messages or []
+                if messages:
+                    await pages.put(self.adapter.to_application_format([m.dict() for m in messages]))
+
+                fetched += len(messages)
+                if len(messages) < page_size or (response.total_count is not None
+                                                 and fetched >= response.total_count):
+                    break
+                cursor += 1
+        except Exception as e:
+            await pages.put(e)
+            return
+
+        await pages.put(None)
+
+    async def export_sessions(self, user_ids: Iterable[str], path: str,
+                              archive_format: ArchiveFormat = ArchiveFormat.NDJSON,
+                              concurrency: int = 4, page_size: int = 100, chunk_size: int = 1000,
+                              checkpoint_path: Optional[str] = None,
+                              checkpoint_every: int = 100) -> int:
+        """Export every session and message of a set of users to an archive.
+        
+        Runs as a streaming pipeline: up to `concurrency` sessions are fetched ahead of the
+        writer, each buffering at most two pages, and records are written out in chunks, so
+        memory use does not grow with the size of the export. Upstream calls run in the
+        background priority class.
+        
+        Args:
+            user_ids: IDs of the users to export
+            path: Path of the archive file (NDJSON) or directory (Parquet)
+            archive_format: Format of the archive
+            concurrency: Maximum number of sessions fetched concurrently
+            page_size: Number of messages fetched per upstream call
+            chunk_size: Number of records buffered before they are written out
+            checkpoint_path: Optional checkpoint file; if it exists the export resumes from it.
+                             Resuming expects the same user list as before.
+            checkpoint_every: Number of sessions between checkpoints
+            
+        Returns:
+            The number of sessions exported by this run
+        """
+        if checkpoint_path:
+            checkpoint = ArchiveCheckpoint.load(checkpoint_path, archive_format)
+        else:
+            checkpoint = ArchiveCheckpoint(format=archive_format)
+        # Cursor of the last session written: user index, user ID, sort key of the session
+        cursor: Optional[Tuple[int, Optional[str], Tuple[str, str]]] = None
+        users_seen = 0
+
+        writer = create_writer(path, archive_format, chunk_size)
+        writer.open(checkpoint.position)
+        feeds: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        fetchers: set = set()
+
+        async def produce() -> None:
+            nonlocal users_seen
+            try:
+                for user_index, user_id in enumerate(user_ids):
+                    users_seen = user_index + 1
+                    if user_index < checkpoint.user_index:
+                        continue
+
+                    done_up_to = None
+                    if user_index == checkpoint.user_index:
+                        if checkpoint.user_id not in (None, user_id):
+                            raise ValueError(f"Checkpoint expects user {checkpoint.user_id} at index "
+                                             f"{user_index}, got {user_id}")
+                        done_up_to = checkpoint.last_session
+
+                    zep_sessions = await self._call(user_id, self.zep_client.user.get_sessions, user_id)
+                    # A stable order, so the cursor survives sessions added or removed upstream
+                    keyed = sorted(((zep_session.created_at or "", zep_session.session_id), zep_session)
+                                   for zep_session in zep_sessions)
+                    for key, zep_session in keyed:
+                        if done_up_to is not None and key <= done_up_to:
+                            continue
+                        session = ChatSession.from_zep(zep_session)
+                        pages: asyncio.Queue = asyncio.Queue(maxsize=2)
+                        await feeds.put((session, pages, (user_index, user_id, key)))
+                        fetcher = asyncio.create_task(self._fetch_session_messages(session, pages, page_size))
+                        fetchers.add(fetcher)
+                        fetcher.add_done_callback(fetchers.discard)
+            except Exception as e:
+                await feeds.put(e)
+                return
+
+            await feeds.put(None)
+
+        def save_checkpoint(done: bool = False) -> None:
+            checkpoint.position = writer.commit()
+            if done:
+                checkpoint.user_index, checkpoint.user_id, checkpoint.last_session = users_seen, None, None
+            elif cursor is not None:
+                checkpoint.user_index, checkpoint.user_id, checkpoint.last_session = cursor
+            if checkpoint_path:
+                checkpoint.save(checkpoint_path)
+
+        with self.scheduler.priority(RequestPriority.BACKGROUND):
+            producer = asyncio.create_task(produce())
+
+        exported = 0
+        unsaved = 0
+        try:
+            while (feed := await feeds.get()) is not None:
+                if isinstance(feed, Exception):
+                    raise feed
+
+                session, pages, session_cursor = feed
+                writer.write(session_record(session))
+                while (page := await pages.get()) is not None:
+                    if isinstance(page, Exception):
+                        raise page
+                    for message in page:
+                        writer.write(message_record(session, message))
+
+                cursor = session_cursor
+                exported += 1
+                unsaved += 1
+                if unsaved >= checkpoint_every:
+                    save_checkpoint()
+                    unsaved = 0
+
+            save_checkpoint(done=True)
+        finally:
+            for task in [producer, *fetchers]:
+                task.cancel()
+            writer.close()
+
+        return exported
+
+    async def import_sessions(self, path: str, archive_format: ArchiveFormat = ArchiveFormat.NDJSON,
+                              concurrency: int = 4, batch_size: int = 100, chunk_size: int = 1000,
+                              checkpoint_path: Optional[str] = None,
+                              checkpoint_every: int = 100) -> int:
+        """Import the sessions and messages of an archive written by `export_sessions`.
+        
+        Records are streamed from the archive and messages are converted with the adapter
+        and sent in batches. Up to `concurrency` upstream calls are in flight at once; batches
+        of the same session are always sent in order. Upstream calls run in the background
+        priority class.
+        
+        When resuming from a checkpoint, sessions that were in flight when the previous run
+        stopped are imported again. A session that already exists upstream is kept, and the
+        messages it already holds are taken to be the leading messages of its archive records,
+        so they are not sent twice.
+        
+        Args:
+            path: Path of the archive file (NDJSON) or directory (Parquet)
+            archive_format: Format of the archive
+            concurrency: Maximum number of upstream calls in flight
+            batch_size: Number of messages sent per upstream call
+            chunk_size: Number of rows read per record batch for Parquet archives
+            checkpoint_path: Optional checkpoint file; if it exists the import resumes from it
+            checkpoint_every: Number of sessions between checkpoints
+            
+        Returns:
+            The number of sessions imported by this run
+        """
+        if checkpoint_path:
+            checkpoint = ArchiveCheckpoint.load(checkpoint_path, archive_format)
+        else:
+            checkpoint = ArchiveCheckpoint(format=archive_format)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        # Last task per session, so batches for the same session are sent in order
+        tails: Dict[str, asyncio.Task] = {}
+        unsaved = 0
+        batch: List[Dict[str, Any]] = []
+        batch_owner: Optional[ChatSession] = None
+        # Messages still to skip for sessions that already existed upstream
+        existing: Dict[str, int] = {}
+
+        async def add_session(session: ChatSession) -> None:
+            try:
+                await self._call(session.user_id, self.zep_client.memory.add_session,
+                                 session_id=session.session_id, user_id=session.user_id,
+                                 metadata=session.to_zep_metadata())
+            except ConflictError:
+                response = await self._call(session.user_id, self.zep_client.memory.get_session_messages,
+                                            session.session_id, limit=1)
+                existing[session.session_id] = response.total_count or 0
+
+        async def add_messages(session: ChatSession, messages: List[Dict[str, Any]]) -> None:
+            # Batches of a session run in order after its add_session, so the count is current
+            skip = min(existing.get(session.session_id, 0), len(messages))
+            if skip:
+                existing[session.session_id] -= skip
+                messages = messages[skip:]
+            if not messages:
+                return
+
+            zep_messages = [zep_types.Message(**m) for m in self.adapter.to_external_format(messages)]
+            await self._call(session.user_id, self.zep_client.memory.add, session.session_id,
+                             messages=zep_messages)
+
+        async def submit(session_id: str, call: Callable[[], Awaitable[None]]) -> None:
+            await semaphore.acquire()
+            previous = tails.get(session_id)
+
+            async def run() -> None:
+                try:
+                    if previous is not None:
+                        await previous
+                    await call()
+                finally:
+                    semaphore.release()
+
+            tails[session_id] = asyncio.create_task(run())
+
+        async def flush_batch() -> None:
+            nonlocal batch
+            if batch and batch_owner is not None:
+                messages, owner = batch, batch_owner
+                await submit(owner.session_id, lambda: add_messages(owner, messages))
+            batch = []
+
+        async def save_checkpoint(position: int) -> None:
+            nonlocal unsaved
+            await asyncio.gather(*tails.values())
+            tails.clear()
+            checkpoint.position = position
+            unsaved = 0
+            if checkpoint_path:
+                checkpoint.save(checkpoint_path)
+
+        imported = 0
+        consumed = checkpoint.position
+        try:
+            with self.scheduler.priority(RequestPriority.BACKGROUND):
+                for record in read_records(path, archive_format, checkpoint.position, chunk_size):
+                    if record["record_type"] == "session":
+                        await flush_batch()
+                        if unsaved >= checkpoint_every:
+                            await save_checkpoint(consumed)
+
+                        session = session_from_record(record)
+                        await submit(session.session_id, lambda s=session: add_session(s))
+                        batch_owner = session
+                        unsaved += 1
+                        imported += 1
+                    else:
+                        if batch_owner is None or record["session_id"] != batch_owner.session_id:
+                            await flush_batch()
+                            batch_owner = ChatSession(session_id=record["session_id"],
+                                                      user_id=record["user_id"])
+                        batch.append(message_from_record(record))
+                        if len(batch) >= batch_size:
+                            await flush_batch()
+                    consumed += 1
+
+                await flush_batch()
+                await save_checkpoint(consumed)
+        finally:
+            for task in tails.values():
+                task.cancel()
+
+        return imported
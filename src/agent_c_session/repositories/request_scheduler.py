@@ -0,0 +1,384 @@
+"""RequestScheduler for Agent C Session Manager.
+
+Provides a rate-limit aware scheduler that sits in front of all upstream Zep calls, with
+priority classes, per-user fair queuing and automatic rate adaptation from 429 responses.
+"""
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, Mapping, Optional, TypeVar
+
+import httpx
+from pydantic import BaseModel, Field
+from zep_cloud.core.api_error import ApiError
+
+T = TypeVar("T")
+
+_current_priority: contextvars.ContextVar[Optional["RequestPriority"]] = contextvars.ContextVar(
+    "agent_c_session_request_priority", default=None
+)
+_current_response: contextvars.ContextVar[Optional["_ResponseSlot"]] = contextvars.ContextVar(
+    "agent_c_session_current_response", default=None
+)
+
+
+class RequestPriority(str, Enum):
+    """Priority classes for upstream requests.
+
+    Interactive requests are always dispatched ahead of background requests.
+    """
+
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+
+
+class PriorityClassMetrics(BaseModel):
+    """Queueing metrics for a single priority class.
+
+    Attributes:
+        queue_depth: Number of requests currently waiting for a token
+        dispatched: Total number of requests that have been granted a token
+        total_wait: Cumulative seconds spent waiting by dispatched requests
+        max_wait: Longest wait, in seconds, seen by a dispatched request
+    """
+
+    queue_depth: int = Field(0, description="Requests currently waiting for a token")
+    dispatched: int = Field(0, description="Total requests granted a token")
+    total_wait: float = Field(0.0, description="Cumulative wait time in seconds")
+    max_wait: float = Field(0.0, description="Longest wait time in seconds")
+
+    @property
+    def avg_wait(self) -> float:
+        """Average wait time in seconds of the dispatched requests."""
+        return self.total_wait / self.dispatched if self.dispatched else 0.0
+
+
+class TokenBucket:
+    """A token bucket with an adjustable refill rate.
+
+    Attributes:
+        rate: Tokens added per second
+        capacity: Maximum number of tokens the bucket can hold
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """Initialize a full token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens the bucket can hold
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def try_take(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            0.0 if a token was taken, otherwise the number of seconds until one will be
+        """
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        self._refill(now)
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+
+        return (1.0 - self._tokens) / self.rate
+
+    def block_for(self, seconds: float) -> None:
+        """Drain the bucket and refuse tokens for the given number of seconds.
+
+        Args:
+            seconds: How long to refuse tokens
+        """
+        now = time.monotonic()
+        self._tokens = 0.0
+        self._updated = max(now, self._blocked_until, now + seconds)
+        self._blocked_until = self._updated
+
+
+class _ResponseSlot:
+    # Receives the headers of the HTTP response of the scheduled call in flight
+    __slots__ = ("headers",)
+
+    def __init__(self) -> None:
+        self.headers: Optional[Mapping[str, Any]] = None
+
+
+class _Waiter:
+    __slots__ = ("future", "enqueued_at")
+
+    def __init__(self, future: "asyncio.Future[None]"):
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class RequestScheduler:
+    """Token-bucket scheduler for upstream requests.
+
+    Requests wait in per-priority queues. Within a priority class, requests are grouped by
+    user_id and served round-robin, so a single user running a bulk job cannot starve the
+    others. The refill rate backs off multiplicatively when the upstream answers with a 429
+    and recovers additively on success.
+
+    Response headers reach the scheduler through `on_response`, an httpx event hook that must
+    be installed on the client passed to `AsyncZep`, see `create_httpx_client`.
+
+    A scheduler belongs to the event loop it is first used on. Its waiters and dispatch timer
+    live on that loop, so acquiring from another loop raises a RuntimeError until the first
+    one is closed. Threads share a scheduler by submitting their calls to the owning loop,
+    as SyncChatSessionRepo does.
+
+    Attributes:
+        max_rate: Upper bound for the refill rate in requests per second
+        min_rate: Lower bound the rate can back off to
+        max_retries: Number of times a rate limited call is retried before giving up
+    """
+
+    DEFAULT_USER = "__anonymous__"
+
+    def __init__(self, rate: float = 20.0, burst: Optional[float] = None, min_rate: float = 0.5,
+                 backoff_factor: float = 0.5, recovery_step: Optional[float] = None,
+                 max_retries: int = 3):
+        """Initialize the request scheduler.
+
+        Args:
+            rate: Initial and maximum number of requests per second
+            burst: Bucket capacity, defaults to twice the rate
+            min_rate: Lower bound the rate can back off to after 429 responses
+            backoff_factor: Multiplier applied to the rate on a 429 response
+            recovery_step: Amount the rate grows on each successful call, defaults to 5% of rate
+            max_retries: Number of times a rate limited call is retried
+        """
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step if recovery_step is not None else rate * 0.05
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate, burst if burst is not None else rate * 2)
+
+        self._queues: Dict[RequestPriority, "OrderedDict[str, Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in RequestPriority
+        }
+        self._metrics: Dict[RequestPriority, PriorityClassMetrics] = {
+            priority: PriorityClassMetrics() for priority in RequestPriority
+        }
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def rate(self) -> float:
+        """The current refill rate in requests per second."""
+        return self.bucket.rate
+
+    @contextmanager
+    def priority(self, priority: RequestPriority) -> Iterator[None]:
+        """Run the calls made within this context under the given priority class.
+
+        Args:
+            priority: Priority class to apply
+        """
+        token = _current_priority.set(priority)
+        try:
+            yield
+        finally:
+            _current_priority.reset(token)
+
+    def get_metrics(self) -> Dict[RequestPriority, PriorityClassMetrics]:
+        """Get queueing metrics for each priority class.
+
+        Returns:
+            A snapshot of the metrics keyed by priority class
+        """
+        for priority, queue in self._queues.items():
+            self._metrics[priority].queue_depth = sum(
+                1 for waiters in queue.values() for waiter in waiters if not waiter.future.done()
+            )
+        return {priority: metrics.model_copy() for priority, metrics in self._metrics.items()}
+
+    async def acquire(self, user_id: Optional[str] = None,
+                      priority: Optional[RequestPriority] = None) -> None:
+        """Wait until a request for the given user may be sent upstream.
+
+        Args:
+            user_id: ID of the user the request is made on behalf of
+            priority: Priority class, defaults to the one set by `priority()` or INTERACTIVE
+
+        Raises:
+            RuntimeError: If the scheduler is in use on another event loop
+        """
+        priority = priority or _current_priority.get() or RequestPriority.INTERACTIVE
+        waiter = _Waiter(self._bind_loop().create_future())
+        self._queues[priority].setdefault(user_id or self.DEFAULT_USER, deque()).append(waiter)
+        if self._timer is None:
+            self._dispatch()
+        await waiter.future
+
+    async def run(self, call: Callable[[], Awaitable[T]], user_id: Optional[str] = None,
+                  priority: Optional[RequestPriority] = None) -> T:
+        """Run an upstream call once the scheduler grants it a token.
+
+        Calls rejected with a 429 are retried up to `max_retries` times after the rate has
+        been adapted.
+
+        Args:
+            call: Factory returning the awaitable for the upstream call
+            user_id: ID of the user the request is made on behalf of
+            priority: Priority class, defaults to the one set by `priority()` or INTERACTIVE
+
+        Returns:
+            The result of the call
+        """
+        attempt = 0
+        while True:
+            await self.acquire(user_id, priority)
+            slot = _ResponseSlot()
+            token = _current_response.set(slot)
+            try:
+                result = await call()
+            except ApiError as e:
+                if e.status_code != 429 or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.on_rate_limited(slot.headers)
+                continue
+            finally:
+                _current_response.reset(token)
+
+            self.on_success(slot.headers)
+            return result
+
+    async def on_response(self, response: httpx.Response) -> None:
+        """httpx response event hook capturing the headers for the scheduled call in flight.
+
+        Args:
+            response: The HTTP response received by the client
+        """
+        slot = _current_response.get()
+        if slot is not None:
+            slot.headers = response.headers
+
+    def create_httpx_client(self, **kwargs: Any) -> httpx.AsyncClient:
+        """Create an httpx client that reports response headers to this scheduler.
+
+        Pass the client to `AsyncZep(httpx_client=...)` so rate limit headers adapt the rate.
+
+        Args:
+            **kwargs: Arguments for httpx.AsyncClient
+
+        Returns:
+            The client with the `on_response` event hook installed
+        """
+        hooks = dict(kwargs.pop("event_hooks", None) or {})
+        hooks["response"] = [*hooks.get("response", []), self.on_response]
+        return httpx.AsyncClient(event_hooks=hooks, **kwargs)
+
+    def on_rate_limited(self, headers: Optional[Mapping[str, Any]] = None) -> None:
+        """Back off after the upstream rejected a request with a 429.
+
+        Args:
+            headers: Response headers, used for Retry-After and rate limit hints
+        """
+        self.bucket.rate = max(self.min_rate, self.bucket.rate * self.backoff_factor)
+        retry_after = _header_float(headers, "retry-after")
+        self.bucket.block_for(retry_after if retry_after is not None else 1.0 / self.bucket.rate)
+        self._apply_limit_headers(headers)
+
+    def on_success(self, headers: Optional[Mapping[str, Any]] = None) -> None:
+        """Recover the rate after a successful upstream call.
+
+        Args:
+            headers: Response headers, used for rate limit hints
+        """
+        self.bucket.rate = min(self.max_rate, self.bucket.rate + self.recovery_step)
+        self._apply_limit_headers(headers)
+
+    def _apply_limit_headers(self, headers: Optional[Mapping[str, Any]]) -> None:
+        remaining = _header_float(headers, "x-ratelimit-remaining")
+        reset = _header_float(headers, "x-ratelimit-reset")
+        if remaining is None or reset is None or reset <= 0:
+            return
+
+        # Spread the remaining budget evenly over the rest of the window
+        self.bucket.rate = min(self.max_rate, max(self.min_rate, remaining / reset))
+        if remaining < 1:
+            self.bucket.block_for(reset)
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return loop
+        if self._loop is not None and not self._loop.is_closed():
+            raise RuntimeError("RequestScheduler is bound to another event loop, "
+                               "use one scheduler per loop")
+
+        # The previous loop is gone along with its waiters and timer
+        for queue in self._queues.values():
+            queue.clear()
+        self._timer = None
+        self._loop = loop
+        return loop
+
+    def _peek(self) -> Optional[RequestPriority]:
+        # Drop cancelled waiters from the front of each queue and return the priority class
+        # of the first live one
+        for priority in RequestPriority:
+            queue = self._queues[priority]
+            while queue:
+                user_id, waiters = next(iter(queue.items()))
+                while waiters and waiters[0].future.done():
+                    waiters.popleft()
+                if waiters:
+                    return priority
+                del queue[user_id]
+        return None
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        while (priority := self._peek()) is not None:
+            delay = self.bucket.try_take()
+            if delay > 0:
+                self._timer = self._loop.call_later(delay, self._dispatch)
+                return
+
+            queue = self._queues[priority]
+            user_id, waiters = next(iter(queue.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                queue.move_to_end(user_id)
+            else:
+                del queue[user_id]
+
+            waited = time.monotonic() - waiter.enqueued_at
+            metrics = self._metrics[priority]
+            metrics.dispatched += 1
+            metrics.total_wait += waited
+            metrics.max_wait = max(metrics.max_wait, waited)
+            waiter.future.set_result(None)
+
+
+def _header_float(headers: Optional[Mapping[str, Any]], name: str) -> Optional[float]:
+    if not isinstance(headers, Mapping):
+        return None
+
+    for key, value in headers.items():
+        if key.lower() == name:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+    return None
@@ -0,0 +1,380 @@
+"""Retention policies for Agent C Session Manager.
+
+Bounds the memory held by live sessions: namespace TTLs and a byte budget for metadata, a cap
+on the number of tool calls and a maximum age for messages. Expiry deadlines are kept in a heap,
+so a sweep only touches the entries that are actually due instead of scanning every session.
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+from agent_c_session.models.chat_session import ChatSession
+
+# Heap entry: deadline, tie breaker, session_id, kind, key
+_Entry = Tuple[float, int, str, str, Optional[str]]
+# Tracked metadata key: ("managed", "<namespace>.<key>") or ("meta", "<key>")
+_MetaKey = Tuple[str, str]
+
+
+class RetentionPolicy(BaseModel):
+    """Declarative retention limits for live sessions.
+
+    Attributes:
+        namespace_ttls: Seconds a managed metadata key lives after its last write, by namespace
+                        prefix. The longest matching prefix wins, e.g. `tool.search` over `tool`.
+        max_tool_calls: Maximum number of tool calls kept per session
+        max_metadata_bytes: Maximum encoded size of a session's metadata and managed metadata,
+                            least recently written keys are evicted first
+        max_message_age: Seconds a flushed message is kept in memory
+    """
+
+    namespace_ttls: Dict[str, float] = Field(default_factory=dict, description="Managed metadata TTLs by namespace")
+    max_tool_calls: Optional[int] = Field(None, description="Maximum tool calls per session")
+    max_metadata_bytes: Optional[int] = Field(None, description="Maximum metadata bytes per session")
+    max_message_age: Optional[float] = Field(None, description="Maximum in-memory message age in seconds")
+
+    def ttl_for(self, key: str) -> Optional[float]:
+        """Get the TTL of a managed metadata key.
+
+        Args:
+            key: Full managed metadata key, `<namespace>.<key>`
+
+        Returns:
+            The TTL in seconds of the longest matching namespace, or None
+        """
+        best = None
+        for namespace in self.namespace_ttls:
+            if (key == namespace or key.startswith(f"{namespace}.")) and (best is None or len(namespace) > len(best)):
+                best = namespace
+        return self.namespace_ttls[best] if best is not None else None
+
+
+class RetentionStats(BaseModel):
+    """Eviction counters of a RetentionSweeper.
+
+    Attributes:
+        expired_metadata: Managed metadata keys removed because their TTL passed
+        evicted_metadata: Metadata keys removed to stay within the byte budget
+        evicted_metadata_bytes: Encoded bytes of the keys removed for the byte budget
+        dropped_tool_calls: Tool calls removed over the per-session cap
+        expired_messages: Messages removed because they exceeded the maximum age
+        sweeps: Number of sweeps run
+        scheduled: Number of deadlines currently in the heap
+        sessions: Number of sessions currently watched
+    """
+
+    expired_metadata: int = Field(0, description="Managed metadata keys expired by TTL")
+    evicted_metadata: int = Field(0, description="Metadata keys evicted for the byte budget")
+    evicted_metadata_bytes: int = Field(0, description="Bytes evicted for the byte budget")
+    dropped_tool_calls: int = Field(0, description="Tool calls dropped over the cap")
+    expired_messages: int = Field(0, description="Messages expired by age")
+    sweeps: int = Field(0, description="Sweeps run")
+    scheduled: int = Field(0, description="Deadlines in the heap")
+    sessions: int = Field(0, description="Sessions watched")
+
+
+def _entry_size(session: ChatSession, meta_key: _MetaKey) -> int:
+    kind, key = meta_key
+    value = session.managed_metadata.get(key) if kind == "managed" else session.metadata.get(key)
+    if value is None:
+        return 0
+    encoded = value if isinstance(value, str) else json.dumps(value, default=str)
+    return len(key.encode("utf-8")) + len(encoded.encode("utf-8"))
+
+
+def _written_at(session: ChatSession, meta_key: _MetaKey) -> float:
+    kind, key = meta_key
+    written_at = session.managed_metadata_written_at if kind == "managed" else session.metadata_written_at
+    return written_at.get(key, time.time())
+
+
+class RetentionSweeper:
+    """Enforces a RetentionPolicy on the sessions it watches.
+
+    Tool call caps and the metadata byte budget are enforced as changes arrive through
+    `on_change`. TTLs and message ages are deadlines in a heap that `sweep` pops until the
+    next deadline lies in the future. Each key and each session's messages have at most one
+    pending deadline; a key written again before its deadline is re-armed when that deadline
+    is popped. Sessions are held by weak reference, so watching a session never keeps it alive.
+    Metadata removals only change the live session; the observer registered with `observe`
+    is told about them so it can write the session's metadata back to storage.
+
+    The sweeper is not thread-safe, use it from a single thread. ChatSessionRepo only calls
+    it on its event loop.
+
+    Attributes:
+        policy: The limits to enforce
+        interval: Seconds between two background sweeps
+        stats: Eviction counters
+    """
+
+    def __init__(self, policy: RetentionPolicy, interval: float = 1.0):
+        """Initialize the sweeper.
+
+        Args:
+            policy: The limits to enforce
+            interval: Seconds between two background sweeps
+        """
+        self.policy = policy
+        self.interval = interval
+        self.stats = RetentionStats()
+        self._heap: List[_Entry] = []
+        self._counter = itertools.count()
+        self._sessions: "weakref.WeakValueDictionary[str, ChatSession]" = weakref.WeakValueDictionary()
+        # Per session write times of metadata keys, least recently written first
+        self._written: Dict[str, "OrderedDict[_MetaKey, float]"] = {}
+        # Per session managed metadata keys with a deadline in the heap
+        self._armed: Dict[str, Set[str]] = {}
+        self._sizes: Dict[str, Dict[_MetaKey, int]] = {}
+        self._bytes: Dict[str, int] = {}
+        self._message_deadlines: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._observer: Optional[Callable[[ChatSession], None]] = None
+
+    def observe(self, observer: Optional[Callable[[ChatSession], None]]) -> None:
+        """Register the callback notified when the sweeper removed metadata from a session.
+
+        Called once per sweep entry or budget enforcement that removed keys, with the session.
+
+        Args:
+            observer: The callback, or None to stop observing
+        """
+        self._observer = observer
+
+    def watch(self, session: ChatSession) -> None:
+        """Start enforcing the policy on a session.
+
+        Metadata already on the session counts as written at the time the session recorded for
+        it, or now if it has none, so TTLs survive a reload from Zep or a snapshot. Watching a
+        session twice is a no-op.
+
+        Args:
+            session: The session to watch
+        """
+        session_id = session.session_id
+        if self._sessions.get(session_id) is session:
+            return
+
+        self._forget(session_id)
+        self._sessions[session_id] = session
+        weakref.finalize(session, self._forget_if_gone, session_id)
+        self._written[session_id] = OrderedDict()
+        self._armed[session_id] = set()
+        self._sizes[session_id] = {}
+        self._bytes[session_id] = 0
+
+        now = time.time()
+        writes = [(session.metadata_written_at.get(key, now), ("meta", key)) for key in session.metadata]
+        writes += [(session.managed_metadata_written_at.get(key, now), ("managed", key))
+                   for key in session.managed_metadata]
+        # Oldest first, so the byte budget evicts in write order
+        for written, meta_key in sorted(writes):
+            self._track_meta(session, meta_key, written)
+        self._enforce_metadata_bytes(session)
+        self._enforce_tool_calls(session)
+        self._schedule_messages(session, now)
+
+    def on_change(self, session: ChatSession, change: str, payload: Dict[str, Any]) -> None:
+        """Apply the policy to a change reported by a session observer.
+
+        Args:
+            session: The session that changed
+            change: The change type reported by ChatSession
+            payload: The change payload
+        """
+        if self._sessions.get(session.session_id) is not session:
+            self.watch(session)
+            return
+
+        if change == "metadata_changed":
+            if "namespace" in payload:
+                meta_key = ("managed", f"{payload['namespace']}.{payload['key']}")
+            else:
+                meta_key = ("meta", payload["key"])
+            if payload.get("deleted"):
+                self._untrack_meta(session.session_id, meta_key)
+            else:
+                self._track_meta(session, meta_key, _written_at(session, meta_key))
+                self._enforce_metadata_bytes(session)
+        elif change == "tool_call_added":
+            self._enforce_tool_calls(session)
+        elif change == "messages_added":
+            self._schedule_messages(session, time.time())
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Apply every deadline that is due.
+
+        Args:
+            now: Current time as a Unix timestamp, defaults to time.time()
+
+        Returns:
+            Number of metadata keys and messages removed
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, session_id, kind, key = heapq.heappop(self._heap)
+            session = self._sessions.get(session_id)
+            if session is None:
+                continue
+            if kind == "ttl":
+                removed += self._expire_meta(session, key, now)  # type: ignore[arg-type]
+            elif self._message_deadlines.get(session_id) == deadline:
+                removed += self._expire_messages(session, now)
+
+        self.stats.sweeps += 1
+        return removed
+
+    def get_stats(self) -> RetentionStats:
+        """Get the eviction counters.
+
+        Returns:
+            A copy of the counters with the current heap and session counts
+        """
+        return self.stats.model_copy(update={"scheduled": len(self._heap), "sessions": len(self._sessions)})
+
+    def start(self) -> None:
+        """Run `sweep` every `interval` seconds on the running event loop until `stop`.
+
+        Starting a running sweeper is a no-op.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop the background sweeps."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.sweep()
+
+    def _push(self, deadline: float, session_id: str, kind: str, key: Optional[str] = None) -> None:
+        heapq.heappush(self._heap, (deadline, next(self._counter), session_id, kind, key))
+
+    def _track_meta(self, session: ChatSession, meta_key: _MetaKey, now: float) -> None:
+        session_id = session.session_id
+        written = self._written[session_id]
+        written[meta_key] = now
+        written.move_to_end(meta_key)
+
+        size = _entry_size(session, meta_key)
+        self._bytes[session_id] += size - self._sizes[session_id].get(meta_key, 0)
+        self._sizes[session_id][meta_key] = size
+
+        armed = self._armed[session_id]
+        if meta_key[0] == "managed" and meta_key[1] not in armed:
+            ttl = self.policy.ttl_for(meta_key[1])
+            if ttl is not None:
+                armed.add(meta_key[1])
+                self._push(now + ttl, session_id, "ttl", meta_key[1])
+
+    def _untrack_meta(self, session_id: str, meta_key: _MetaKey) -> None:
+        written = self._written.get(session_id)
+        if written is None or written.pop(meta_key, None) is None:
+            return
+        self._bytes[session_id] -= self._sizes[session_id].pop(meta_key, 0)
+
+    def _delete_meta(self, session: ChatSession, meta_key: _MetaKey) -> None:
+        kind, key = meta_key
+        if kind == "managed":
+            namespace, _, name = key.partition(".")
+            session.delete_managed_meta(namespace, name)
+        else:
+            session.delete_meta(key)
+        # The session observer normally reports the deletion already; this covers unobserved sessions
+        self._untrack_meta(session.session_id, meta_key)
+
+    def _expire_meta(self, session: ChatSession, key: str, now: float) -> int:
+        session_id = session.session_id
+        armed = self._armed[session_id]
+        if key not in armed:
+            # Left over from before the session was watched again
+            return 0
+        armed.discard(key)
+
+        meta_key = ("managed", key)
+        written = self._written[session_id].get(meta_key)
+        ttl = self.policy.ttl_for(key)
+        if written is None or ttl is None:
+            return 0
+        if written + ttl > now:
+            # Written again since the deadline was pushed
+            armed.add(key)
+            self._push(written + ttl, session_id, "ttl", key)
+            return 0
+
+        self._delete_meta(session, meta_key)
+        self.stats.expired_metadata += 1
+        self._notify(session)
+        return 1
+
+    def _enforce_metadata_bytes(self, session: ChatSession) -> None:
+        budget = self.policy.max_metadata_bytes
+        if budget is None:
+            return
+
+        session_id = session.session_id
+        written = self._written[session_id]
+        evicted = False
+        while self._bytes[session_id] > budget and written:
+            meta_key = next(iter(written))
+            size = self._sizes[session_id].get(meta_key, 0)
+            self._delete_meta(session, meta_key)
+            self.stats.evicted_metadata += 1
+            self.stats.evicted_metadata_bytes += size
+            evicted = True
+        if evicted:
+            self._notify(session)
+
+    def _notify(self, session: ChatSession) -> None:
+        if self._observer is not None:
+            self._observer(session)
+
+    def _enforce_tool_calls(self, session: ChatSession) -> None:
+        if self.policy.max_tool_calls is not None:
+            self.stats.dropped_tool_calls += session.drop_tool_calls(self.policy.max_tool_calls)
+
+    def _schedule_messages(self, session: ChatSession, now: float) -> None:
+        max_age = self.policy.max_message_age
+        session_id = session.session_id
+        if max_age is None or session_id in self._message_deadlines:
+            return
+
+        oldest = session.get_oldest_message()
+        if oldest is None:
+            return
+
+        # Pending messages are never dropped, so an overdue deadline is retried after an interval
+        deadline = max(oldest.timestamp.timestamp() + max_age, now + self.interval)
+        self._message_deadlines[session_id] = deadline
+        self._push(deadline, session_id, "messages")
+
+    def _expire_messages(self, session: ChatSession, now: float) -> int:
+        del self._message_deadlines[session.session_id]
+        dropped = session.drop_messages_before(datetime.fromtimestamp(now - self.policy.max_message_age))
+        self.stats.expired_messages += dropped
+        self._schedule_messages(session, now)
+        return dropped
+
+    def _forget_if_gone(self, session_id: str) -> None:
+        if session_id not in self._sessions:
+            self._forget(session_id)
+
+    def _forget(self, session_id: str) -> None:
+        self._written.pop(session_id, None)
+        self._armed.pop(session_id, None)
+        self._sizes.pop(session_id, None)
+        self._bytes.pop(session_id, None)
+        self._message_deadlines.pop(session_id, None)
@@ -0,0 +1,381 @@
+"""Session archive formats for Agent C Session Manager.
+
+Provides the chunked writers, streaming readers and resumable checkpoints used by
+`ChatSessionRepo.export_sessions` and `ChatSessionRepo.import_sessions`.
+
+An archive is a flat stream of records. Each session is written as one `session` record
+followed by one `message` record per message, and the records of a session are always
+contiguous. NDJSON archives are a single file; Parquet archives are a directory of part files,
+each holding one or more record batches.
+"""
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from agent_c_session.models.chat_session import ChatSession
+
+RECORD_FIELDS = ["record_type", "session_id", "user_id", "title", "role", "role_type", "content",
+                 "timestamp", "metadata"]
+
+
+class ArchiveFormat(str, Enum):
+    """Supported archive formats."""
+
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+class ArchiveCheckpoint(BaseModel):
+    """Resumable progress of an export or import.
+
+    An export is resumed from a cursor into its list of users: the users before `user_index`
+    are done, and so are the sessions of the user at `user_index` that sort up to
+    `last_session`. Sessions are exported in `(created_at, session_id)` order, so the cursor
+    stays valid when sessions are added or removed upstream between runs. The checkpoint has
+    a fixed size whatever the size of the export.
+
+    Attributes:
+        format: Format of the archive the checkpoint belongs to
+        position: Writer position (export) or number of records consumed (import)
+        user_index: Index of the first user of the export not fully covered by `position`
+        user_id: ID of the user at `user_index`, used to detect a changed user list
+        last_session: Sort key of the last session of the user at `user_index` covered by
+                      `position`, None if none is
+    """
+
+    format: ArchiveFormat = Field(..., description="Format of the archive")
+    position: int = Field(0, description="Committed writer position or records consumed")
+    user_index: int = Field(0, description="First user not fully exported")
+    user_id: Optional[str] = Field(None, description="ID of the user at user_index")
+    last_session: Optional[Tuple[str, str]] = Field(None, description="Sort key of the last session "
+                                                                      "exported for the user at user_index")
+
+    @classmethod
+    def load(cls, path: str, archive_format: ArchiveFormat) -> "ArchiveCheckpoint":
+        """Load a checkpoint, or start a new one if the file does not exist.
+
+        Args:
+            path: Path of the checkpoint file
+            archive_format: Format of the archive being processed
+
+        Returns:
+            The loaded or a new checkpoint
+
+        Raises:
+            ValueError: If the checkpoint belongs to an archive of another format
+        """
+        if not os.path.exists(path):
+            return cls(format=archive_format)
+
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = cls.model_validate_json(f.read())
+        if checkpoint.format != archive_format:
+            raise ValueError(f"Checkpoint {path} is for a {checkpoint.format.value} archive")
+        return checkpoint
+
+    def save(self, path: str) -> None:
+        """Atomically write the checkpoint to disk.
+
+        Args:
+            path: Path of the checkpoint file
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.model_dump_json())
+        os.replace(tmp_path, path)
+
+
+def session_record(session: ChatSession) -> Dict[str, Any]:
+    """Build the archive record for a session.
+
+    Args:
+        session: The session to archive
+
+    Returns:
+        A flat archive record
+    """
+    metadata = session.to_zep_metadata()
+    metadata.pop("title", None)
+    return {
+        "record_type": "session",
+        "session_id": session.session_id,
+        "user_id": session.user_id,
+        "title": session.title,
+        "role": None,
+        "role_type": None,
+        "content": None,
+        "timestamp": session.created_at.isoformat(),
+        "metadata": json.dumps(metadata, default=str),
+    }
+
+
+def message_record(session: ChatSession, message: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the archive record for a message in application format.
+
+    Args:
+        session: The session the message belongs to
+        message: The message as produced by `ZepAdapter.to_application_format`
+
+    Returns:
+        A flat archive record
+    """
+    timestamp = message.get("timestamp")
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    return {
+        "record_type": "message",
+        "session_id": session.session_id,
+        "user_id": session.user_id,
+        "title": None,
+        "role": message.get("role"),
+        "role_type": message.get("role_type"),
+        "content": message.get("content"),
+        "timestamp": timestamp,
+        "metadata": json.dumps(message.get("metadata") or {}, default=str),
+    }
+
+
+def session_from_record(record: Dict[str, Any]) -> ChatSession:
+    """Rebuild a session from its archive record.
+
+    Args:
+        record: A `session` archive record
+
+    Returns:
+        The archived ChatSession, without messages
+    """
+    metadata = json.loads(record.get("metadata") or "{}")
+    managed_metadata = metadata.pop("managed_metadata", None) or {}
+    metadata_written_at = metadata.pop("metadata_written_at", None) or {}
+    managed_metadata_written_at = metadata.pop("managed_metadata_written_at", None) or {}
+    fields = {"created_at": record["timestamp"]} if record.get("timestamp") else {}
+    return ChatSession(session_id=record["session_id"], user_id=record["user_id"],
+                       title=record.get("title"), metadata=metadata,
+                       managed_metadata=managed_metadata, metadata_written_at=metadata_written_at,
+                       managed_metadata_written_at=managed_metadata_written_at, **fields)
+
+
+def message_from_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a message in application format from its archive record.
+
+    Args:
+        record: A `message` archive record
+
+    Returns:
+        The message in application format
+    """
+    message = {
+        "role": record.get("role"),
+        "role_type": record.get("role_type"),
+        "content": record.get("content") or "",
+        "metadata": json.loads(record.get("metadata") or "{}"),
+    }
+    if record.get("timestamp"):
+        message["timestamp"] = record["timestamp"]
+    return message
+
+
+class ArchiveWriter(ABC):
+    """Base class for chunked archive writers.
+
+    Records are buffered and written out every `chunk_size` records. `commit` flushes the
+    buffer and returns a position that `open` can later resume from.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1000):
+        """Initialize the writer.
+
+        Args:
+            path: Path of the archive
+            chunk_size: Number of records buffered before they are written out
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self._buffer: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Add a record to the archive.
+
+        Args:
+            record: A flat archive record
+        """
+        self._buffer.append(record)
+        if len(self._buffer) >= self.chunk_size:
+            self._write_chunk(self._buffer)
+            self._buffer = []
+
+    def commit(self) -> int:
+        """Flush buffered records to durable storage.
+
+        Returns:
+            A position the archive can be resumed from
+        """
+        if self._buffer:
+            self._write_chunk(self._buffer)
+            self._buffer = []
+        return self._commit()
+
+    @abstractmethod
+    def open(self, position: int = 0) -> None:
+        """Open the archive for writing, discarding anything written after `position`.
+
+        Args:
+            position: A position previously returned by `commit`, 0 to start over
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Commit and close the archive."""
+        pass
+
+    @abstractmethod
+    def _write_chunk(self, records: List[Dict[str, Any]]) -> None:
+        pass
+
+    @abstractmethod
+    def _commit(self) -> int:
+        pass
+
+
+class NDJSONWriter(ArchiveWriter):
+    """Writes archive records as newline delimited JSON to a single file.
+
+    Positions are byte offsets into the file.
+    """
+
+    _file: Any = None
+
+    def open(self, position: int = 0) -> None:
+        mode = "r+b" if position and os.path.exists(self.path) else "wb"
+        self._file = open(self.path, mode)
+        self._file.seek(position)
+        self._file.truncate()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.commit()
+            self._file.close()
+            self._file = None
+
+    def _write_chunk(self, records: List[Dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(record) + "\n" for record in records).encode("utf-8"))
+
+    def _commit(self) -> int:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return int(self._file.tell())
+
+
+class ParquetWriter(ArchiveWriter):
+    """Writes archive records as Arrow record batches to a directory of Parquet part files.
+
+    Each commit closes the current part file, so positions are the number of completed parts.
+    Requires the optional `pyarrow` dependency.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Parquet archives require pyarrow, install agent-c-session[parquet]") from e
+
+        super().__init__(path, chunk_size)
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._schema = pyarrow.schema([(name, pyarrow.string()) for name in RECORD_FIELDS])
+        self._part = 0
+        self._part_writer: Any = None
+
+    def open(self, position: int = 0) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        for name in os.listdir(self.path):
+            if name.startswith("part-") and name.endswith(".parquet") and _part_index(name) >= position:
+                os.remove(os.path.join(self.path, name))
+        self._part = position
+
+    def close(self) -> None:
+        self.commit()
+
+    def _write_chunk(self, records: List[Dict[str, Any]]) -> None:
+        if self._part_writer is None:
+            self._part_writer = self._pq.ParquetWriter(
+                os.path.join(self.path, f"part-{self._part:05d}.parquet"), self._schema)
+        columns = {name: [record.get(name) for record in records] for name in RECORD_FIELDS}
+        self._part_writer.write_batch(self._pa.RecordBatch.from_pydict(columns, schema=self._schema))
+
+    def _commit(self) -> int:
+        if self._part_writer is not None:
+            self._part_writer.close()
+            self._part_writer = None
+            self._part += 1
+        return self._part
+
+
+def _part_index(name: str) -> int:
+    return int(name[len("part-"):-len(".parquet")])
+
+
+def create_writer(path: str, archive_format: ArchiveFormat, chunk_size: int = 1000) -> ArchiveWriter:
+    """Create a writer for the given archive format.
+
+    Args:
+        path: Path of the archive
+        archive_format: Format of the archive
+        chunk_size: Number of records buffered before they are written out
+
+    Returns:
+        An unopened archive writer
+    """
+    if archive_format == ArchiveFormat.PARQUET:
+        return ParquetWriter(path, chunk_size)
+    return NDJSONWriter(path, chunk_size)
+
+
+def read_records(path: str, archive_format: ArchiveFormat, skip: int = 0,
+                 chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """Stream the records of an archive.
+
+    Args:
+        path: Path of the archive
+        archive_format: Format of the archive
+        skip: Number of leading records to skip, used when resuming
+        chunk_size: Number of rows read per record batch for Parquet archives
+
+    Yields:
+        Flat archive records in archive order
+    """
+    if archive_format == ArchiveFormat.PARQUET:
+        records = _read_parquet(path, chunk_size)
+    else:
+        records = _read_ndjson(path)
+
+    for index, record in enumerate(records):
+        if index >= skip:
+            yield record
+
+
+def _read_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _read_parquet(path: str, chunk_size: int) -> Iterator[Dict[str, Any]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet archives require pyarrow, install agent-c-session[parquet]") from e
+
+    parts = sorted((name for name in os.listdir(path)
+                    if name.startswith("part-") and name.endswith(".parquet")), key=_part_index)
+    for name in parts:
+        for batch in pq.ParquetFile(os.path.join(path, name)).iter_batches(batch_size=chunk_size):
+            yield from batch.to_pylist()
@@ -0,0 +1,348 @@
+"""Session events for Agent C Session Manager.
+
+Provides the in-process change feed emitted by `ChatSessionRepo` and the sessions it hands out,
+with bounded per-subscriber queues and pluggable fan-out transports.
+"""
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+from enum import Enum
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+
+class SessionEventType(str, Enum):
+    """Types of change events."""
+
+    SESSION_CREATED = "session_created"
+    MESSAGES_ADDED = "messages_added"
+    METADATA_CHANGED = "metadata_changed"
+    USER_UPDATED = "user_updated"
+    SESSION_REMOVED = "session_removed"
+
+
+class OverflowPolicy(str, Enum):
+    """What a subscription does when its queue is full.
+
+    DROP_OLDEST discards the oldest queued event, DROP_NEWEST discards the incoming event and
+    DISCONNECT closes the subscription, which then raises SubscriptionOverflowError.
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
+class SubscriptionOverflowError(Exception):
+    """Raised by a DISCONNECT subscription that fell behind and was closed."""
+
+
+class SessionEvent(BaseModel):
+    """A change to a session or user.
+
+    Attributes:
+        event_type: Type of the change
+        user_id: ID of the user the change belongs to
+        session_id: ID of the session the change belongs to, None for user events
+        timestamp: When the change happened
+        payload: Event specific details
+    """
+
+    event_type: SessionEventType = Field(..., description="Type of the change")
+    user_id: str = Field(..., description="ID of the user the change belongs to")
+    session_id: Optional[str] = Field(None, description="ID of the session the change belongs to")
+    timestamp: datetime = Field(default_factory=datetime.now, description="Event timestamp")
+    payload: Dict[str, Any] = Field(default_factory=dict, description="Event specific details")
+
+
+class EventSubscription:
+    """A bounded queue of events for one subscriber, consumed with `async for`.
+
+    Attributes:
+        event_types: Event types delivered to the subscriber, None for all
+        user_id: Only deliver events for this user, None for all
+        maxsize: Maximum number of queued events
+        overflow: Policy applied when the queue is full
+        dropped: Number of events discarded because the queue was full
+    """
+
+    def __init__(self, bus: "SessionEventBus", event_types: Optional[Iterable[SessionEventType]] = None,
+                 user_id: Optional[str] = None, maxsize: int = 1000,
+                 overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        """Initialize the subscription, use `SessionEventBus.subscribe` instead.
+
+        Args:
+            bus: The bus the subscription belongs to
+            event_types: Event types to receive, None for all
+            user_id: Only receive events for this user, None for all
+            maxsize: Maximum number of queued events
+            overflow: Policy applied when the queue is full
+        """
+        self.event_types = set(event_types) if event_types is not None else None
+        self.user_id = user_id
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self._bus = bus
+        self._queue: Deque[SessionEvent] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._overflowed = False
+
+    def __aiter__(self) -> "EventSubscription":
+        return self
+
+    async def __anext__(self) -> SessionEvent:
+        while not self._queue:
+            if self._overflowed:
+                raise SubscriptionOverflowError(f"Subscription fell behind by more than {self.maxsize} events")
+            if self._closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+    def matches(self, event: SessionEvent) -> bool:
+        """Check whether an event should be delivered to this subscription.
+
+        Args:
+            event: The event to check
+
+        Returns:
+            True if the event passes the subscription filters
+        """
+        if self.event_types is not None and event.event_type not in self.event_types:
+            return False
+        return self.user_id is None or event.user_id == self.user_id
+
+    def push(self, event: SessionEvent) -> None:
+        """Queue an event, applying the overflow policy if the queue is full.
+
+        Args:
+            event: The event to queue
+        """
+        if self._closed:
+            return
+
+        if len(self._queue) >= self.maxsize:
+            self.dropped += 1
+            if self.overflow == OverflowPolicy.DROP_NEWEST:
+                return
+            if self.overflow == OverflowPolicy.DISCONNECT:
+                self._queue.clear()
+                self._overflowed = True
+                self.close()
+                return
+            self._queue.popleft()
+
+        self._queue.append(event)
+        self._ready.set()
+
+    @property
+    def qsize(self) -> int:
+        """Number of events waiting to be consumed."""
+        return len(self._queue)
+
+    def close(self) -> None:
+        """Stop receiving events. Queued events can still be consumed."""
+        self._closed = True
+        self._bus.unsubscribe(self)
+        self._ready.set()
+
+
+class EventTransport(ABC):
+    """Base class for transports that fan events out of the process."""
+
+    @abstractmethod
+    async def start(self) -> None:
+        """Start accepting consumers."""
+        pass
+
+    @abstractmethod
+    def publish(self, event: SessionEvent) -> None:
+        """Send an event to every connected consumer without blocking.
+
+        Args:
+            event: The event to send
+        """
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Disconnect every consumer and stop the transport."""
+        pass
+
+
+class UnixSocketPublisher(EventTransport):
+    """Publishes events as newline delimited JSON to consumers connected on a Unix socket.
+
+    Each consumer gets its own bounded queue; when a consumer falls behind, its oldest
+    queued events are dropped.
+
+    Attributes:
+        path: Filesystem path of the socket
+        max_pending: Maximum number of events queued per consumer
+    """
+
+    def __init__(self, path: str, max_pending: int = 1000):
+        """Initialize the publisher.
+
+        Args:
+            path: Filesystem path of the socket
+            max_pending: Maximum number of events queued per consumer
+        """
+        self.path = path
+        self.max_pending = max_pending
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._consumers: Set["asyncio.Queue[Optional[bytes]]"] = set()
+        self._connected: Optional[asyncio.Condition] = None
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._connected = asyncio.Condition()
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+
+    async def wait_for_consumers(self, count: int = 1) -> None:
+        """Wait until at least the given number of consumers are connected.
+
+        Events published before a consumer is connected do not reach it.
+
+        Args:
+            count: Number of consumers to wait for
+
+        Raises:
+            RuntimeError: If the publisher has not been started
+        """
+        if self._connected is None:
+            raise RuntimeError("UnixSocketPublisher has not been started")
+        async with self._connected:
+            await self._connected.wait_for(lambda: len(self._consumers) >= count)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=self.max_pending)
+        self._consumers.add(queue)
+        async with self._connected:
+            self._connected.notify_all()
+        try:
+            while (line := await queue.get()) is not None:
+                writer.write(line)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._consumers.discard(queue)
+            writer.close()
+
+    def publish(self, event: SessionEvent) -> None:
+        line = event.model_dump_json().encode("utf-8") + b"\n"
+        for queue in self._consumers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(line)
+
+    async def close(self) -> None:
+        for queue in self._consumers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class SessionEventBus:
+    """Fans change events out to subscriptions and transports.
+
+    `emit` never blocks and may be called from any thread; events emitted off the bus's
+    event loop are handed over to it.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: List[EventSubscription] = []
+        self._transports: List[EventTransport] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self) -> None:
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+    def subscribe(self, event_types: Optional[Iterable[SessionEventType]] = None,
+                  user_id: Optional[str] = None, maxsize: int = 1000,
+                  overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST) -> EventSubscription:
+        """Subscribe to change events.
+
+        Args:
+            event_types: Event types to receive, None for all
+            user_id: Only receive events for this user, None for all
+            maxsize: Maximum number of queued events
+            overflow: Policy applied when the queue is full
+
+        Returns:
+            The subscription, to be consumed with `async for`
+        """
+        self._bind_loop()
+        subscription = EventSubscription(self, event_types, user_id, maxsize, overflow)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        """Remove a subscription.
+
+        Args:
+            subscription: The subscription to remove
+        """
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    async def add_transport(self, transport: EventTransport) -> None:
+        """Start a transport and publish every subsequent event to it.
+
+        Args:
+            transport: The transport to add
+        """
+        self._bind_loop()
+        await transport.start()
+        self._transports.append(transport)
+
+    async def close(self) -> None:
+        """Close every subscription and transport."""
+        for subscription in list(self._subscriptions):
+            subscription.close()
+        for transport in self._transports:
+            await transport.close()
+        self._transports.clear()
+
+    def emit(self, event: SessionEvent) -> None:
+        """Deliver an event to the matching subscriptions and every transport.
+
+        Args:
+            event: The event to deliver
+        """
+        if not self._subscriptions and not self._transports:
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self._loop is not None and running is not self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._deliver, event)
+        else:
+            self._deliver(event)
+
+    def _deliver(self, event: SessionEvent) -> None:
+        for subscription in list(self._subscriptions):
+            if subscription.matches(event):
+                subscription.push(event)
+        for transport in self._transports:
+            transport.publish(event)
@@ -0,0 +1,259 @@
+"""SyncChatSessionRepo for Agent C Session Manager.
+
+Provides a synchronous facade over ChatSessionRepo for threaded applications (Flask, Celery)
+that runs one long-lived event loop on a background thread.
+"""
+import asyncio
+import threading
+from typing import Any, Coroutine, Dict, List, Optional, TypeVar
+from agent_c_session.models.chat_user import ChatUser
+from agent_c_session.models.chat_session import ChatSession
+from agent_c_session.repositories.chat_session_repo import ChatSessionRepo
+from agent_c_session.repositories.request_scheduler import RequestScheduler
+from agent_c_session.repositories.retention import RetentionSweeper
+from zep_cloud.client import AsyncZep
+
+T = TypeVar("T")
+
+
+class EventLoopThread:
+    """A daemon thread running a single asyncio event loop.
+
+    Coroutines can be submitted from any thread and their results waited on synchronously.
+    """
+
+    def __init__(self, name: str = "agent-c-session-loop"):
+        """Start the event loop thread.
+
+        Args:
+            name: Name of the background thread
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name=name, daemon=True)
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the loop thread is alive."""
+        return self._thread.is_alive()
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the loop thread and wait for its result.
+
+        Args:
+            coro: The coroutine to run
+            timeout: Maximum number of seconds to wait for the result
+
+        Returns:
+            The result of the coroutine
+
+        Raises:
+            RuntimeError: If called from the loop thread itself, which would deadlock
+            TimeoutError: If the result is not available within the timeout
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("EventLoopThread.run cannot be called from its own loop thread")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Cancel the tasks still running on the loop, stop it and wait for the thread to exit."""
+        if not self.is_running:
+            return
+
+        async def _cancel_tasks() -> None:
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.run(_cancel_tasks())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class SyncChatSessionRepo:
+    """Synchronous facade over ChatSessionRepo.
+
+    All calls are executed on one event loop owned by a background thread, so the pooled
+    Zep client and the request scheduler are shared by every caller thread instead of being
+    rebuilt by `asyncio.run` on each call. Instances are safe to share between threads.
+
+    Attributes:
+        repo: The underlying async repository, only to be used on the loop thread
+        timeout: Default number of seconds to wait for each call, None waits forever
+    """
+
+    def __init__(self, zep_client: Optional[AsyncZep] = None, zep_api_key: Optional[str] = None,
+                 scheduler: Optional[RequestScheduler] = None, timeout: Optional[float] = None,
+                 loop_thread: Optional[EventLoopThread] = None, retention: Optional[RetentionSweeper] = None):
+        """Initialize the synchronous repository.
+
+        Args:
+            zep_client: A zep client instance for interacting with Zep Cloud API
+            zep_api_key: API key for authenticating with Zep Cloud if not client provided
+            scheduler: Scheduler for upstream calls, a default one is created if not provided.
+                       It must not be in use on another running event loop.
+            timeout: Default number of seconds to wait for each call
+            loop_thread: Event loop thread to run on, a dedicated one is started if not provided
+            retention: Sweeper enforcing retention limits on the sessions handed out
+        """
+        self._owns_loop = loop_thread is None
+        self._loop_thread = loop_thread or EventLoopThread()
+
+        async def _build() -> ChatSessionRepo:
+            # Build the repo on the loop thread so the client's connection pool lives there
+            return ChatSessionRepo(zep_client=zep_client, zep_api_key=zep_api_key, scheduler=scheduler,
+                                   retention=retention, sync_timeout=timeout)
+
+        self.repo = self._loop_thread.run(_build())
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """Default number of seconds to wait for each call, including `ChatSession.flush_sync`."""
+        return self.repo.sync_timeout
+
+    @timeout.setter
+    def timeout(self, timeout: Optional[float]) -> None:
+        self.repo.sync_timeout = timeout
+
+    def __enter__(self) -> "SyncChatSessionRepo":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for pending flushes, then stop the background event loop if this instance owns it.
+
+        Raises:
+            Exception: The error of the first flush that failed and was not waited for
+        """
+        if not self._loop_thread.is_running:
+            return
+
+        try:
+            self._run(self.repo.close())
+        finally:
+            if self._owns_loop:
+                self._loop_thread.stop()
+
+    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+        return self._loop_thread.run(coro, self.timeout)
+
+    def _bind(self, user: ChatUser) -> ChatUser:
+        user.bind_repo(self)
+        return user
+
+    def add_chat_user(self, user: ChatUser) -> ChatUser:
+        """Add a new chat user.
+
+        Args:
+            user: ChatUser model with user details
+
+        Returns:
+            The created ChatUser
+        """
+        return self._bind(self._run(self.repo.add_chat_user(user)))
+
+    def update_chat_user_info(self, user: ChatUser) -> ChatUser:
+        """Update an existing chat user.
+
+        Args:
+            user: ChatUser model with updated user details
+
+        Returns:
+            The updated ChatUser
+        """
+        return self._bind(self._run(self.repo.update_chat_user_info(user)))
+
+    def delete_chat_user(self, user_id: str) -> None:
+        """Delete a chat user.
+
+        Args:
+            user_id: ID of the user to delete
+        """
+        self._run(self.repo.delete_chat_user(user_id))
+
+    def get_chat_user(self, user_id: str) -> ChatUser:
+        """Get a chat user by user_id.
+
+        Args:
+            user_id: ID of the user to retrieve
+
+        Returns:
+            The requested ChatUser
+        """
+        return self._bind(self._run(self.repo.get_chat_user(user_id)))
+
+    def get_user_sessions(self, username: str, limit: int = 10, offset: int = 0) -> List[ChatSession]:
+        """Get chat sessions for a user.
+
+        Args:
+            username: Username of the user
+            limit: Maximum number of sessions to return
+            offset: Number of sessions to skip for pagination
+
+        Returns:
+            List of ChatSession objects belonging to the user
+        """
+        return self._run(self.repo.get_user_sessions(username, limit, offset))
+
+    def search_user_sessions(self, username: str, query: str, limit: int = 10) -> List[ChatSession]:
+        """Search for chat sessions for a user.
+
+        Args:
+            username: Username of the user
+            query: Search query string
+            limit: Maximum number of sessions to return
+
+        Returns:
+            List of ChatSession objects matching the search criteria
+        """
+        return self._run(self.repo.search_user_sessions(username, query, limit))
+
+    def get_user_session(self, username: str, session_id: str) -> ChatSession:
+        """Get a specific chat session for a user.
+
+        Args:
+            username: Username of the user
+            session_id: ID of the session to retrieve
+
+        Returns:
+            The requested ChatSession
+        """
+        return self._run(self.repo.get_user_session(username, session_id))
+
+    def remove_user_session(self, username: str, session_id: str) -> None:
+        """Remove a chat session for a user.
+
+        Args:
+            username: Username of the user
+            session_id: ID of the session to remove
+        """
+        self._run(self.repo.remove_user_session(username, session_id))
+
+    def new_session(self, username: str, title: Optional[str] = None,
+                    initial_metadata: Optional[Dict[str, Any]] = None) -> ChatSession:
+        """Create a new chat session for a user.
+
+        Args:
+            username: Username of the user
+            title: Optional title for the session
+            initial_metadata: Optional initial metadata for the session
+
+        Returns:
+            The created ChatSession
+        """
+        return self._run(self.repo.new_session(username, title, initial_metadata))
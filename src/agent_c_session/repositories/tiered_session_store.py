@@ -0,0 +1,459 @@
+"""TieredSessionStore for Agent C Session Manager.
+
+Provides the local tiers in front of the remote backend used by `ChatSessionRepo.get_user_session`:
+a hot in-process LRU bounded by byte size and a warm memory-mapped segment store on local disk.
+"""
+import mmap
+import os
+import struct
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+from agent_c_session.models.chat_session import ChatSession
+
+# Segment record header: key length, value length. A value length of 0 marks a deletion.
+_HEADER = struct.Struct("<HI")
+_SEGMENT_PREFIX = "segment-"
+_SEGMENT_SUFFIX = ".dat"
+
+
+class TierStats(BaseModel):
+    """Hit and miss counters for a single storage tier.
+
+    Attributes:
+        hits: Number of lookups served by the tier
+        misses: Number of lookups the tier could not serve
+        entries: Number of sessions currently held by the tier
+        bytes: Number of bytes currently held by the tier
+    """
+
+    hits: int = Field(0, description="Lookups served by the tier")
+    misses: int = Field(0, description="Lookups the tier could not serve")
+    entries: int = Field(0, description="Sessions currently held")
+    bytes: int = Field(0, description="Bytes currently held")
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served by the tier."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class HotSessionCache:
+    """In-process LRU cache of live ChatSession objects bounded by serialized size.
+
+    Cached sessions keep changing while they are in use. Sessions reported through
+    `mark_changed` are re-measured before the next insert decides what to evict.
+
+    Attributes:
+        max_bytes: Byte budget of the cache
+    """
+
+    def __init__(self, max_bytes: int):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Byte budget of the cache
+        """
+        self.max_bytes = max_bytes
+        self.stats = TierStats()
+        self._entries: "OrderedDict[str, Tuple[ChatSession, int]]" = OrderedDict()
+        self._changed: Set[str] = set()
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        """Get a session and mark it as most recently used.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            The cached session, or None
+        """
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(session_id)
+        self.stats.hits += 1
+        return entry[0]
+
+    def put(self, session: ChatSession, size: int) -> List[ChatSession]:
+        """Add or refresh a session, evicting least recently used sessions over budget.
+
+        The session being added is never evicted, so a single session larger than the budget
+        is still cached.
+
+        Args:
+            session: The session to cache
+            size: Serialized size of the session in bytes
+
+        Returns:
+            The evicted sessions, least recently used first
+        """
+        self.refresh_sizes()
+        self.pop(session.session_id)
+        self._entries[session.session_id] = (session, size)
+        self.stats.entries += 1
+        self.stats.bytes += size
+
+        evicted = []
+        while self.stats.bytes > self.max_bytes and len(self._entries) > 1:
+            evicted.append(self.pop(next(iter(self._entries))))
+        return evicted  # type: ignore[return-value]
+
+    def mark_changed(self, session_id: str) -> None:
+        """Record that a cached session changed and has to be re-measured.
+
+        Args:
+            session_id: ID of the session
+        """
+        if session_id in self._entries:
+            self._changed.add(session_id)
+
+    def refresh_sizes(self) -> None:
+        """Re-measure the sessions that changed since they were last measured."""
+        for session_id in self._changed:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                continue
+            session, size = entry
+            new_size = len(session.to_snapshot())
+            # Assigning an existing key keeps its LRU position
+            self._entries[session_id] = (session, new_size)
+            self.stats.bytes += new_size - size
+        self._changed.clear()
+
+    def peek(self, session_id: str) -> Optional[ChatSession]:
+        """Get a session without updating the LRU order or the statistics.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            The cached session, or None
+        """
+        entry = self._entries.get(session_id)
+        return entry[0] if entry is not None else None
+
+    def pop(self, session_id: str) -> Optional[ChatSession]:
+        """Remove a session from the cache.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            The removed session, or None
+        """
+        self._changed.discard(session_id)
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return None
+
+        self.stats.entries -= 1
+        self.stats.bytes -= entry[1]
+        return entry[0]
+
+    def sessions(self) -> List[ChatSession]:
+        """Get every cached session, least recently used first."""
+        return [session for session, _ in self._entries.values()]
+
+
+class WarmSegmentStore:
+    """Append-only, memory-mapped segment store of serialized sessions on local disk.
+
+    Writes are appended to the active segment, which is sealed once it reaches
+    `segment_size`. Reads go through a read-only mmap of the segment. When the store grows
+    past `max_bytes` the oldest segment is dropped along with the sessions it holds, which
+    then fall through to the cold tier. The index is rebuilt by scanning the segments on open.
+
+    Attributes:
+        path: Directory holding the segment files
+        max_bytes: Byte budget of the store
+        segment_size: Size at which the active segment is sealed
+    """
+
+    def __init__(self, path: str, max_bytes: int, segment_size: int):
+        """Open the store, creating the directory if needed.
+
+        Args:
+            path: Directory holding the segment files
+            max_bytes: Byte budget of the store
+            segment_size: Size at which the active segment is sealed
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.segment_size = segment_size
+        self.stats = TierStats()
+
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self._segment_sizes: "OrderedDict[int, int]" = OrderedDict()
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._active: Optional[int] = None
+
+        os.makedirs(path, exist_ok=True)
+        for segment in sorted(self._list_segments()):
+            self._scan_segment(segment)
+        self._refresh_stats()
+
+    def _list_segments(self) -> List[int]:
+        return [int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)]) for name in os.listdir(self.path)
+                if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX)]
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"{_SEGMENT_PREFIX}{segment:08d}{_SEGMENT_SUFFIX}")
+
+    def _scan_segment(self, segment: int) -> None:
+        size = os.path.getsize(self._segment_path(segment))
+        offset = 0
+        with open(self._segment_path(segment), "rb") as f:
+            while offset + _HEADER.size <= size:
+                key_len, value_len = _HEADER.unpack(f.read(_HEADER.size))
+                key = f.read(key_len).decode("utf-8")
+                value_offset = offset + _HEADER.size + key_len
+                if value_offset + value_len > size:
+                    break  # torn write at the end of the segment
+                f.seek(value_len, os.SEEK_CUR)
+                if value_len:
+                    self._index[key] = (segment, value_offset, value_len)
+                else:
+                    self._index.pop(key, None)
+                offset = value_offset + value_len
+
+        if offset < size:
+            os.truncate(self._segment_path(segment), offset)
+        self._segment_sizes[segment] = offset
+        self._active = segment
+
+    def _refresh_stats(self) -> None:
+        self.stats.entries = len(self._index)
+        self.stats.bytes = sum(self._segment_sizes.values())
+
+    def _map(self, segment: int) -> mmap.mmap:
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < self._segment_sizes[segment]:
+            if mapped is not None:
+                mapped.close()
+            with open(self._segment_path(segment), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mapped
+        return mapped
+
+    def _append(self, key: str, value: bytes) -> Tuple[int, int]:
+        if self._active is None or self._segment_sizes[self._active] >= self.segment_size:
+            self._active = (self._active + 1) if self._active is not None else 0
+            self._segment_sizes[self._active] = 0
+
+        encoded_key = key.encode("utf-8")
+        offset = self._segment_sizes[self._active]
+        with open(self._segment_path(self._active), "ab") as f:
+            f.write(_HEADER.pack(len(encoded_key), len(value)) + encoded_key + value)
+        self._segment_sizes[self._active] = offset + _HEADER.size + len(encoded_key) + len(value)
+        return self._active, offset + _HEADER.size + len(encoded_key)
+
+    def _drop_oldest_segment(self) -> None:
+        segment = next(iter(self._segment_sizes))
+        del self._segment_sizes[segment]
+        mapped = self._maps.pop(segment, None)
+        if mapped is not None:
+            mapped.close()
+        os.remove(self._segment_path(segment))
+        for key in [k for k, location in self._index.items() if location[0] == segment]:
+            del self._index[key]
+
+    def get(self, session_id: str) -> Optional[bytes]:
+        """Read a serialized session.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            The serialized session, or None
+        """
+        location = self._index.get(session_id)
+        if location is None:
+            self.stats.misses += 1
+            return None
+
+        segment, offset, length = location
+        self.stats.hits += 1
+        return self._map(segment)[offset:offset + length]
+
+    def put(self, session_id: str, data: bytes) -> None:
+        """Write a serialized session, replacing any previous version.
+
+        Args:
+            session_id: ID of the session
+            data: The serialized session
+        """
+        segment, offset = self._append(session_id, data)
+        self._index[session_id] = (segment, offset, len(data))
+        while sum(self._segment_sizes.values()) > self.max_bytes and len(self._segment_sizes) > 1:
+            self._drop_oldest_segment()
+        self._refresh_stats()
+
+    def delete(self, session_id: str) -> None:
+        """Remove a session from the store.
+
+        Args:
+            session_id: ID of the session
+        """
+        if self._index.pop(session_id, None) is not None:
+            self._append(session_id, b"")
+            self._refresh_stats()
+
+    def close(self) -> None:
+        """Release the memory maps."""
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+
+
+class TieredSessionStore:
+    """Hot and warm local tiers for ChatSession objects.
+
+    Sessions enter the hot tier when they are loaded from the cold tier or looked up. Sessions
+    evicted from the hot tier are demoted to the warm tier (if configured), and warm hits are
+    promoted back to the hot tier. The cold tier is the remote backend, whose lookups are
+    recorded with `record_cold`.
+
+    Dirty sessions are demoted like any other, their snapshot carries the unflushed messages.
+    The store hands out at most one live object per session ID: as long as a session is
+    referenced anywhere, lookups return that object rather than a copy of its snapshot.
+
+    Attributes:
+        hot: The in-process LRU tier
+        warm: The on-disk segment tier, None when disabled
+        cold: Statistics for lookups that reached the remote backend
+    """
+
+    def __init__(self, hot_max_bytes: int = 64 * 1024 * 1024, warm_path: Optional[str] = None,
+                 warm_max_bytes: int = 1024 * 1024 * 1024, segment_size: int = 64 * 1024 * 1024):
+        """Initialize the store.
+
+        Args:
+            hot_max_bytes: Byte budget of the in-process tier
+            warm_path: Directory for the on-disk tier, the tier is disabled if not provided
+            warm_max_bytes: Byte budget of the on-disk tier
+            segment_size: Size at which on-disk segments are sealed
+        """
+        self.hot = HotSessionCache(hot_max_bytes)
+        self.warm = WarmSegmentStore(warm_path, warm_max_bytes, segment_size) if warm_path else None
+        self.cold = TierStats()
+        self._live: "weakref.WeakValueDictionary[str, ChatSession]" = weakref.WeakValueDictionary()
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        """Look a session up in the local tiers, promoting warm hits to the hot tier.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            The session, or None if it has to be loaded from the cold tier
+        """
+        session = self.hot.get(session_id)
+        if session is not None:
+            return session
+
+        session = self._live.get(session_id)
+        if session is not None:
+            # Demoted while still in use, the live object is at least as new as its snapshot
+            self.put(session)
+            return session
+
+        data = self.warm.get(session_id) if self.warm is not None else None
+        if data is None:
+            return None
+
+        session = ChatSession.from_snapshot(data)
+        self._live[session_id] = session
+        self._put_hot(session, len(data))
+        return session
+
+    def put(self, session: ChatSession) -> ChatSession:
+        """Add or refresh a session in the hot tier, measuring its current size.
+
+        Any warm snapshot of the session is dropped, the live object is authoritative. A copy
+        of a session that is already live is not stored.
+
+        Args:
+            session: The session to store
+
+        Returns:
+            The live session for the ID, which is `session` unless another object is live
+        """
+        live = self._live.get(session.session_id)
+        if live is not None and live is not session:
+            return live
+
+        self._live[session.session_id] = session
+        self._put_hot(session, len(session.to_snapshot()))
+        if self.warm is not None:
+            self.warm.delete(session.session_id)
+        return session
+
+    def touch(self, session: ChatSession) -> None:
+        """Record that a live session changed.
+
+        A hot session is re-measured before the next insert. A session that was demoted to
+        the warm tier while its owner kept using it is put back in the hot tier, so lookups
+        never return its stale snapshot. Changes to a copy of a live session are ignored.
+
+        Args:
+            session: The session that changed
+        """
+        if self.hot.peek(session.session_id) is session:
+            self.hot.mark_changed(session.session_id)
+        else:
+            self.put(session)
+
+    def _put_hot(self, session: ChatSession, size: int) -> None:
+        for evicted in self.hot.put(session, size):
+            if self.warm is not None:
+                self.warm.put(evicted.session_id, evicted.to_snapshot())
+
+    def record_cold(self, hit: bool) -> None:
+        """Record the outcome of a lookup against the cold tier.
+
+        Args:
+            hit: Whether the remote backend had the session
+        """
+        if hit:
+            self.cold.hits += 1
+        else:
+            self.cold.misses += 1
+
+    def invalidate(self, session_id: str) -> None:
+        """Remove a session from every local tier.
+
+        Args:
+            session_id: ID of the session
+        """
+        self.hot.pop(session_id)
+        self._live.pop(session_id, None)
+        if self.warm is not None:
+            self.warm.delete(session_id)
+
+    def get_stats(self) -> Dict[str, TierStats]:
+        """Get per-tier statistics.
+
+        Returns:
+            A snapshot of the statistics keyed by tier name
+        """
+        self.hot.refresh_sizes()
+        stats = {"hot": self.hot.stats.model_copy(), "cold": self.cold.model_copy()}
+        if self.warm is not None:
+            stats["warm"] = self.warm.stats.model_copy()
+        return stats
+
+    def close(self) -> None:
+        """Demote every hot session to the warm tier and release the memory maps."""
+        if self.warm is None:
+            return
+
+        for session in self.hot.sessions():
+            self.warm.put(session.session_id, session.to_snapshot())
+        self.warm.close()
@@ -49,4 +49,39 @@ class TestChatSession:
         assert message.role == "user"
         assert message.content == "Hello, world!"
         assert isinstance(message.timestamp, datetime)
-        assert message.metadata == {}
\ No newline at end of file
+        assert message.metadata == {}
+        
+    def test_message_log(self):
+        """Test adding messages and paging through them."""
+        session = ChatSession(session_id="session123", user_id="user456")
+        session.add_message({"role": "user", "content": "one"})
+        session.add_interaction([ChatMessage(role="assistant", content="two"),
+                                 {"role": "user", "content": "three"}])
+        
+        messages = session.get_messages(limit=2)
+        assert [m.content for m in messages] == ["two", "three"]
+        assert [m.content for m in session.get_messages(before_id=messages[0].message_id)] == ["one"]
+        
+        assert len(session.get_pending_messages()) == 3
+        session.mark_flushed()
+        assert session.get_pending_messages() == []
+    
+    def test_get_set_managed_meta(self):
+        """Test getting and setting namespaced managed metadata."""
+        session = ChatSession(session_id="session123", user_id="user456")
+        session.set_managed_meta("tool", "search.limit", 5)
+        
+        assert session.get_managed_meta("tool", "search.limit") == 5
+        assert session.get_managed_meta("tool", "missing", "default") == "default"
+    
+    def test_snapshot_round_trip(self):
+        """Test serializing a session with its message and tool call logs."""
+        session = ChatSession(session_id="session123", user_id="user456", title="Snapshot")
+        session.add_message({"role": "user", "content": "hello"})
+        session.add_tool_call({"tool_name": "search", "parameters": {"query": "zep"}})
+        
+        restored = ChatSession.from_snapshot(session.to_snapshot())
+        assert restored.title == "Snapshot"
+        assert [m.content for m in restored.get_messages()] == ["hello"]
+        assert restored.get_tool_calls()[0].tool_name == "search"
+        assert len(restored.get_pending_messages()) == 1
@@ -1,9 +1,17 @@
 """Unit tests for the ChatSessionRepo."""
 
+import time
+
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
+import zep_cloud.types as zep_types
+from zep_cloud.core.api_error import ApiError
 from agent_c_session.repositories.chat_session_repo import ChatSessionRepo
-from agent_c_session.models import ChatUser
+from agent_c_session.repositories.retention import RetentionPolicy, RetentionSweeper
+from agent_c_session.repositories.session_archive import ArchiveCheckpoint, ArchiveFormat, read_records
+from agent_c_session.repositories.tiered_session_store import TieredSessionStore
+from agent_c_session.loadgen.fake_backend import BackendModel, FakeZepBackend
+from agent_c_session.models import ChatSession, ChatUser
 
 @pytest.fixture
 def mock_zep_client():
@@ -59,4 +67,256 @@ class TestChatSessionRepo:
         # assert result.session_id == "session123"
         # assert result.user_id == "testuser"
         # assert result.title == "Test Session"
-        # assert mock_zep_client.session.create.called
\ No newline at end of file
+        # assert mock_zep_client.session.create.called
+    
+    @pytest.mark.asyncio
+    async def test_export_import_sessions(self, mock_zep_client, tmp_path):
+        """Test exporting sessions to an archive and importing them back."""
+        mock_zep_client.user.get_sessions = AsyncMock(return_value=[
+            zep_types.Session(session_id=f"session{i}", user_id="testuser", metadata={"title": f"S{i}"})
+            for i in range(3)
+        ])
+        messages = [zep_types.Message(role="user", role_type="user", content=f"hello {i}") for i in range(5)]
+        mock_zep_client.memory.get_session_messages = AsyncMock(side_effect=lambda session_id, limit, cursor, **kwargs:
+            zep_types.MessageListResponse(messages=messages[(cursor - 1) * limit:cursor * limit],
+                                          total_count=len(messages)))
+        mock_zep_client.memory.add_session = AsyncMock()
+        mock_zep_client.memory.add = AsyncMock()
+
+        repo = ChatSessionRepo(zep_client=mock_zep_client)
+        path = str(tmp_path / "export.ndjson")
+        checkpoint_path = str(tmp_path / "export.checkpoint")
+
+        assert await repo.export_sessions(["testuser"], path, page_size=2,
+                                          checkpoint_path=checkpoint_path) == 3
+        # A resumed export skips the sessions recorded in the checkpoint
+        assert await repo.export_sessions(["testuser"], path, checkpoint_path=checkpoint_path) == 0
+
+        assert await repo.import_sessions(path, batch_size=2) == 3
+        assert mock_zep_client.memory.add_session.await_count == 3
+        sent = [m.content for call in mock_zep_client.memory.add.await_args_list
+                for m in call.kwargs["messages"] if call.args[0] == "session0"]
+        assert sent == [m.content for m in messages]
+
+    @pytest.mark.asyncio
+    async def test_resumed_import_does_not_resend_messages(self, tmp_path):
+        """Test that resuming an interrupted import sends every message upstream once."""
+        source = FakeZepBackend(BackendModel(median_latency=0))
+        source.users["testuser"] = {"user_id": "testuser"}
+        for i in range(3):
+            source.sessions[f"session{i}"] = {
+                "user_id": "testuser", "metadata": {}, "created_at": f"2024-01-0{i + 1}T00:00:00Z",
+                "messages": [zep_types.Message(role="user", role_type="user", content=f"s{i} m{j}")
+                             for j in range(5)]}
+        path = str(tmp_path / "export.ndjson")
+        await ChatSessionRepo(zep_client=source).export_sessions(["testuser"], path)
+
+        target = FakeZepBackend(BackendModel(median_latency=0))
+        target.users["testuser"] = {"user_id": "testuser"}
+        add = target.memory.add
+        calls = []
+
+        async def flaky_add(session_id, messages, **kwargs):
+            calls.append(session_id)
+            # The second batch of session1, after its first one was stored
+            if len(calls) == 5:
+                raise ApiError(status_code=500, body="boom")
+            await add(session_id, messages, **kwargs)
+
+        target.memory.add = flaky_add
+        repo = ChatSessionRepo(zep_client=target)
+        checkpoint_path = str(tmp_path / "import.checkpoint")
+        with pytest.raises(ApiError):
+            await repo.import_sessions(path, batch_size=2, checkpoint_path=checkpoint_path, checkpoint_every=1)
+        assert len(target.sessions["session1"]["messages"]) == 2
+
+        await repo.import_sessions(path, batch_size=2, checkpoint_path=checkpoint_path, checkpoint_every=1)
+
+        for session_id, session in source.sessions.items():
+            assert [m.content for m in target.sessions[session_id]["messages"]] == \
+                [m.content for m in session["messages"]]
+
+    @pytest.mark.asyncio
+    async def test_export_resumes_from_user_cursor(self, mock_zep_client, tmp_path):
+        """Test that an interrupted export resumes after the last checkpointed session."""
+        sessions = [zep_types.Session(session_id=f"session{i}", user_id="testuser",
+                                      created_at=f"2024-01-0{i + 1}T00:00:00Z") for i in range(4)]
+        # Zep does not guarantee the order of the listing
+        mock_zep_client.user.get_sessions = AsyncMock(return_value=[sessions[2], sessions[0], sessions[1]])
+        failing = {"session2"}
+
+        async def get_session_messages(session_id, limit, cursor, **kwargs):
+            if session_id in failing:
+                raise RuntimeError("connection reset")
+            return zep_types.MessageListResponse(messages=[], total_count=0)
+
+        mock_zep_client.memory.get_session_messages = AsyncMock(side_effect=get_session_messages)
+        repo = ChatSessionRepo(zep_client=mock_zep_client)
+        path = str(tmp_path / "export.ndjson")
+        checkpoint_path = str(tmp_path / "export.checkpoint")
+
+        with pytest.raises(RuntimeError):
+            await repo.export_sessions(["testuser"], path, checkpoint_path=checkpoint_path, checkpoint_every=1)
+        checkpoint = ArchiveCheckpoint.load(checkpoint_path, ArchiveFormat.NDJSON)
+        assert (checkpoint.user_index, checkpoint.user_id) == (0, "testuser")
+        assert checkpoint.last_session == ("2024-01-02T00:00:00Z", "session1")
+
+        # An exported session was removed upstream and a new one added before the resume
+        failing.clear()
+        mock_zep_client.user.get_sessions.return_value = [sessions[3], sessions[2], sessions[1]]
+        assert await repo.export_sessions(["testuser"], path, checkpoint_path=checkpoint_path) == 2
+        assert [r["session_id"] for r in read_records(path, ArchiveFormat.NDJSON)] == \
+            ["session0", "session1", "session2", "session3"]
+
+    @pytest.mark.asyncio
+    async def test_get_user_session_uses_local_tiers(self, mock_zep_client):
+        """Test that a session loaded from Zep is served from the hot tier afterwards."""
+        mock_zep_client.memory.get_session = AsyncMock(
+            return_value=zep_types.Session(session_id="session123", user_id="testuser"))
+        mock_zep_client.memory.get = AsyncMock(return_value=zep_types.Memory(
+            messages=[zep_types.Message(role="user", role_type="user", content="hello")]))
+
+        repo = ChatSessionRepo(zep_client=mock_zep_client)
+        session = await repo.get_user_session("testuser", "session123")
+        assert [m.content for m in session.get_messages()] == ["hello"]
+
+        assert await repo.get_user_session("testuser", "session123") is session
+        assert mock_zep_client.memory.get_session.await_count == 1
+
+        stats = repo.session_store.get_stats()
+        assert stats["hot"].hits == 1
+        assert stats["cold"].hits == 1
+
+    @pytest.mark.asyncio
+    async def test_evicted_session_mutated_and_flushed_is_not_served_stale(self, mock_zep_client, tmp_path):
+        """Test evict, mutate, flush, get: the live session wins over its warm snapshot."""
+        mock_zep_client.memory.add_session = AsyncMock()
+        mock_zep_client.memory.add = AsyncMock()
+        mock_zep_client.memory.update_session = AsyncMock()
+
+        store = TieredSessionStore(hot_max_bytes=200, warm_path=str(tmp_path))
+        repo = ChatSessionRepo(zep_client=mock_zep_client, session_store=store)
+        session = await repo.new_session("testuser", "A")
+        session.add_message({"role": "user", "content": "first"})
+        await repo.new_session("testuser", "B")
+        # Dirty sessions are demoted along with their unflushed messages
+        snapshot = ChatSession.from_snapshot(store.warm.get(session.session_id))
+        assert [m.content for m in snapshot.get_pending_messages()] == ["first"]
+
+        await repo.flush_session(session)
+        await repo.new_session("testuser", "C")
+        assert store.warm.get(session.session_id) is not None
+
+        session.add_message({"role": "user", "content": "second"})
+        await repo.flush_session(session)
+        loaded = await repo.get_user_session("testuser", session.session_id)
+
+        assert loaded is session
+        assert [m.content for m in loaded.get_messages()] == ["first", "second"]
+        assert loaded.get_pending_messages() == []
+        sent = [m.content for call in mock_zep_client.memory.add.await_args_list for m in call.kwargs["messages"]]
+        assert sent == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_listed_sessions_are_the_live_sessions(self):
+        """Test list, mutate, get: every lookup returns the one live session with its messages."""
+        backend = FakeZepBackend(BackendModel(median_latency=0))
+        backend.users["testuser"] = {"user_id": "testuser"}
+        writer = ChatSessionRepo(zep_client=backend)
+        created = await writer.new_session("testuser", "Chat")
+        created.add_message({"role": "user", "content": "hello"})
+        await writer.flush_session(created)
+
+        repo = ChatSessionRepo(zep_client=backend)
+        [listed] = await repo.get_user_sessions("testuser")
+        listed.set_meta("topic", "greetings")
+        listed.add_message({"role": "assistant", "content": "hi"})
+        loaded = await repo.get_user_session("testuser", created.session_id)
+
+        assert loaded is listed
+        assert [m.content for m in loaded.get_messages()] == ["hello", "hi"]
+        assert loaded.get_meta("topic") == "greetings"
+        assert (await repo.get_user_sessions("testuser"))[0] is listed
+
+    @pytest.mark.asyncio
+    async def test_flush_errors_are_surfaced(self, mock_zep_client):
+        """Test that a failed background flush raises from the flush awaitable and from close."""
+        mock_zep_client.memory.add_session = AsyncMock()
+        mock_zep_client.memory.add = AsyncMock(side_effect=ApiError(status_code=500, body="boom"))
+
+        repo = ChatSessionRepo(zep_client=mock_zep_client)
+        session = await repo.new_session("testuser", "Test Session")
+        session.add_message({"role": "user", "content": "hello"})
+        with pytest.raises(ApiError):
+            await session.flush()
+
+        with pytest.raises(RuntimeError):
+            session.flush_sync()
+        session.flush()
+        with pytest.raises(ApiError):
+            await repo.close()
+        assert session.get_pending_messages()[0].content == "hello"
+
+    @pytest.mark.asyncio
+    async def test_session_changes_emit_events(self, mock_zep_client):
+        """Test that creating a session, adding messages and flushing emit change events."""
+        mock_zep_client.memory.add_session = AsyncMock()
+        mock_zep_client.memory.add = AsyncMock()
+        mock_zep_client.memory.update_session = AsyncMock()
+
+        repo = ChatSessionRepo(zep_client=mock_zep_client)
+        subscription = repo.events.subscribe(user_id="testuser")
+
+        session = await repo.new_session("testuser", "Test Session")
+        session.add_message({"role": "user", "content": "hello"})
+        session.set_managed_meta("tool", "search.limit", 5)
+        await repo.flush_session(session)
+        subscription.close()
+
+        events = [event async for event in subscription]
+        assert [e.event_type.value for e in events] == ["session_created", "messages_added",
+                                                         "metadata_changed", "messages_added"]
+        assert events[-1].payload["flushed"] is True
+        assert session.get_pending_messages() == []
+        assert mock_zep_client.memory.add.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retention_applies_to_handed_out_sessions(self, mock_zep_client):
+        """Test that sessions handed out by the repo are bounded by its retention policy."""
+        mock_zep_client.memory.add_session = AsyncMock()
+        mock_zep_client.memory.update_session = AsyncMock()
+
+        retention = RetentionSweeper(RetentionPolicy(max_tool_calls=1, namespace_ttls={"tool": 0}))
+        repo = ChatSessionRepo(zep_client=mock_zep_client, retention=retention)
+        session = await repo.new_session("testuser", "Test Session")
+        session.add_tool_call({"tool_name": "search", "parameters": {}})
+        session.add_tool_call({"tool_name": "calculator", "parameters": {}})
+        session.set_managed_meta("tool", "search.limit", 5)
+        retention.sweep()
+        retention.stop()
+
+        assert [call.tool_name for call in session.get_tool_calls()] == ["calculator"]
+        assert session.get_managed_meta("tool", "search.limit") is None
+        stats = retention.get_stats()
+        assert stats.dropped_tool_calls == 1
+        assert stats.expired_metadata == 1
+
+    @pytest.mark.asyncio
+    async def test_retention_removals_are_written_upstream(self):
+        """Test that metadata expired by the retention sweeper is removed from Zep as well."""
+        backend = FakeZepBackend(BackendModel(median_latency=0))
+        backend.users["testuser"] = {"user_id": "testuser"}
+        retention = RetentionSweeper(RetentionPolicy(namespace_ttls={"tool": 10}))
+        repo = ChatSessionRepo(zep_client=backend, retention=retention)
+        session = await repo.new_session("testuser", "Test Session")
+        session.set_managed_meta("tool", "search.limit", 5)
+        session.set_managed_meta("application", "theme", "dark")
+        await repo.flush_session(session)
+        assert "tool.search.limit" in backend.sessions[session.session_id]["metadata"]["managed_metadata"]
+
+        retention.sweep(time.time() + 11)
+        await repo.close()
+
+        managed_metadata = backend.sessions[session.session_id]["metadata"]["managed_metadata"]
+        assert "tool.search.limit" not in managed_metadata
+        assert "application.theme" in managed_metadata
@@ -0,0 +1,75 @@
+"""Unit tests for the load generator."""
+
+import pytest
+from agent_c_session.loadgen.fake_backend import BackendModel
+from agent_c_session.loadgen.profiles import TraceEvent, WorkloadProfile, get_profile
+from agent_c_session.loadgen.runner import LoadReport, LoadRunner, compare_reports
+
+
+@pytest.fixture
+def make_profile():
+    """Fixture for building small workload profiles with overrides."""
+    def factory(**overrides):
+        settings = dict(name="test", sessions=20, users=4, duration=0.2, think_time=0.01,
+                        operations={"add_interaction": 3, "add_tool_call": 1, "set_managed_meta": 1,
+                                    "get_messages": 1, "get_user_session": 1, "flush": 2},
+                        backend=BackendModel(median_latency=0.001, seed=7))
+        settings.update(overrides)
+        return WorkloadProfile(**settings)
+
+    return factory
+
+
+class TestLoadRunner:
+    """Test suite for the LoadRunner."""
+
+    @pytest.mark.asyncio
+    async def test_profile_run_reports_every_operation(self, make_profile, tmp_path):
+        """Test that a profile run reports latency for each operation and can be saved."""
+        report = await LoadRunner(make_profile()).run()
+
+        assert report.operations["new_session"].count == 20
+        assert set(report.operations) >= {"add_interaction", "flush"}
+        assert report.throughput > 0
+        assert report.backend_calls > 0
+
+        path = str(tmp_path / "report.json")
+        report.save(path)
+        assert LoadReport.load(path).total_operations == report.total_operations
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted(self, make_profile):
+        """Test that failures from the backend error model are counted per operation."""
+        profile = make_profile(operations={"flush": 1},
+                           backend=BackendModel(median_latency=0, error_rate=1.0, seed=1))
+        report = await LoadRunner(profile).run()
+
+        assert report.operations["new_session"].errors > 0
+
+    @pytest.mark.asyncio
+    async def test_trace_replay(self, make_profile):
+        """Test replaying a recorded trace."""
+        trace = [TraceEvent(at=0, session="a", op="new_session"),
+                 TraceEvent(at=0.01, session="a", op="add_interaction"),
+                 TraceEvent(at=0.02, session="a", op="flush")]
+        runner = LoadRunner(make_profile())
+        report = await runner.run(trace, trace_name="recorded")
+
+        assert report.profile == "recorded"
+        assert report.sessions == 1
+        assert report.operations["flush"].count == 1
+
+    def test_get_profile_overrides(self):
+        """Test resolving a built-in profile with overrides."""
+        profile = get_profile("chat", sessions=10, duration=1)
+
+        assert profile.sessions == 10
+        assert get_profile("chat").sessions == 5000
+        with pytest.raises(ValueError):
+            get_profile("missing-profile")
+
+    def test_compare_reports(self):
+        """Test comparing two reports."""
+        lines = compare_reports(LoadReport(profile="a", throughput=100), LoadReport(profile="b", throughput=150))
+
+        assert lines[0] == "throughput ops/s: 100.00 -> 150.00 (+50.0%)"
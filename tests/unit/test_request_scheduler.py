@@ -0,0 +1,146 @@
+"""Unit tests for the RequestScheduler."""
+
+import asyncio
+
+import httpx
+import pytest
+from zep_cloud.client import AsyncZep
+from zep_cloud.core.api_error import ApiError
+
+from agent_c_session.repositories.request_scheduler import RequestPriority, RequestScheduler
+
+
+class TestRequestScheduler:
+    """Test suite for the RequestScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result(self):
+        """Test that a scheduled call returns the upstream result."""
+        scheduler = RequestScheduler(rate=100)
+
+        async def call():
+            return "ok"
+
+        assert await scheduler.run(call, user_id="user1") == "ok"
+        assert scheduler.get_metrics()[RequestPriority.INTERACTIVE].dispatched == 1
+
+    @pytest.mark.asyncio
+    async def test_fair_queuing_between_users(self):
+        """Test that a noisy user does not starve a quiet one within a priority class."""
+        scheduler = RequestScheduler(rate=1000, burst=1)
+        order = []
+
+        async def request(user_id):
+            await scheduler.acquire(user_id)
+            order.append(user_id)
+
+        # Hold back tokens until every request has queued
+        scheduler.bucket.block_for(0.05)
+        tasks = [asyncio.create_task(request("noisy")) for _ in range(5)]
+        tasks.append(asyncio.create_task(request("quiet")))
+        await asyncio.gather(*tasks)
+
+        assert order[:3] == ["noisy", "quiet", "noisy"]
+
+    @pytest.mark.asyncio
+    async def test_interactive_before_background(self):
+        """Test that interactive requests are dispatched ahead of background ones."""
+        scheduler = RequestScheduler(rate=1000, burst=1)
+        order = []
+
+        async def request(priority):
+            await scheduler.acquire("user1", priority)
+            order.append(priority)
+
+        # Hold back tokens until every request has queued, background ones first
+        scheduler.bucket.block_for(0.05)
+        background = [asyncio.create_task(request(RequestPriority.BACKGROUND)) for _ in range(3)]
+        interactive = asyncio.create_task(request(RequestPriority.INTERACTIVE))
+        await asyncio.gather(interactive, *background)
+
+        assert order == [RequestPriority.INTERACTIVE] + [RequestPriority.BACKGROUND] * 3
+
+    def test_bound_to_one_event_loop(self):
+        """Test that a scheduler refuses a second live event loop and moves on once the first closes."""
+        scheduler = RequestScheduler(rate=100)
+        first = asyncio.new_event_loop()
+        second = asyncio.new_event_loop()
+        try:
+            first.run_until_complete(scheduler.acquire("user1"))
+            with pytest.raises(RuntimeError):
+                second.run_until_complete(scheduler.acquire("user1"))
+
+            first.close()
+            second.run_until_complete(scheduler.acquire("user1"))
+        finally:
+            first.close()
+            second.close()
+
+        assert scheduler.get_metrics()[RequestPriority.INTERACTIVE].dispatched == 2
+
+    @pytest.mark.asyncio
+    async def test_priority_context(self):
+        """Test that the priority context manager applies to calls made within it."""
+        scheduler = RequestScheduler(rate=100)
+
+        with scheduler.priority(RequestPriority.BACKGROUND):
+            await scheduler.acquire("user1")
+
+        metrics = scheduler.get_metrics()
+        assert metrics[RequestPriority.BACKGROUND].dispatched == 1
+        assert metrics[RequestPriority.INTERACTIVE].dispatched == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_backs_off_and_retries(self):
+        """Test that a 429 halves the rate and the call is retried."""
+        scheduler = RequestScheduler(rate=100, min_rate=1)
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ApiError(status_code=429)
+            return "ok"
+
+        assert await scheduler.run(call) == "ok"
+        assert len(attempts) == 2
+        assert scheduler.rate < 100
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(self):
+        """Test that non rate limit errors propagate immediately."""
+        scheduler = RequestScheduler(rate=100)
+
+        async def call():
+            raise ApiError(status_code=500)
+
+        with pytest.raises(ApiError):
+            await scheduler.run(call)
+
+    def test_rate_limit_headers(self):
+        """Test that rate limit headers adjust the refill rate."""
+        scheduler = RequestScheduler(rate=100, min_rate=1)
+
+        scheduler.on_success({"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "5"})
+        assert scheduler.rate == 2
+
+    @pytest.mark.asyncio
+    async def test_headers_from_httpx_event_hook(self):
+        """Test that response headers of SDK calls reach the scheduler and it owns the retries."""
+        scheduler = RequestScheduler(rate=100, min_rate=1)
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if len(requests) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0.01"}, json={"message": "slow down"})
+            return httpx.Response(200, headers={"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "5"},
+                                  json={"user_id": "user1"})
+
+        client = AsyncZep(api_key="test", httpx_client=scheduler.create_httpx_client(
+            transport=httpx.MockTransport(handler)))
+        user = await scheduler.run(lambda: client.user.get("user1", request_options={"max_retries": 0}))
+
+        assert user.user_id == "user1"
+        assert len(requests) == 2
+        assert scheduler.rate == 2
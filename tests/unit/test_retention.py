@@ -0,0 +1,154 @@
+"""Unit tests for the retention policies."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import zep_cloud.types as zep_types
+from agent_c_session.models import ChatSession
+from agent_c_session.repositories.retention import RetentionPolicy, RetentionSweeper
+
+
+@pytest.fixture
+def watched():
+    """Fixture for building a session watched by a new sweeper."""
+    def factory(policy):
+        session = ChatSession(session_id="session1", user_id="user1")
+        sweeper = RetentionSweeper(policy)
+        session.observe(sweeper.on_change)
+        sweeper.watch(session)
+        return sweeper, session
+
+    return factory
+
+
+class TestRetentionSweeper:
+    """Test suite for the RetentionSweeper."""
+
+    def test_longest_namespace_ttl_wins(self):
+        """Test resolving the TTL of a managed metadata key."""
+        policy = RetentionPolicy(namespace_ttls={"tool": 60, "tool.search": 5})
+
+        assert policy.ttl_for("tool.search.query") == 5
+        assert policy.ttl_for("tool.calculator.last") == 60
+        assert policy.ttl_for("application.theme") is None
+
+    def test_namespace_ttl_expires_only_due_keys(self, watched, monkeypatch):
+        """Test that a sweep removes expired keys and skips keys rewritten since."""
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        sweeper, session = watched(RetentionPolicy(namespace_ttls={"tool": 10}))
+        session.set_managed_meta("tool", "search.query", "old")
+        session.set_managed_meta("tool", "search.page", 1)
+        session.set_managed_meta("application", "theme", "dark")
+
+        assert sweeper.sweep(now + 5) == 0
+        monkeypatch.setattr(time, "time", lambda: now + 5)
+        session.set_managed_meta("tool", "search.page", 2)
+
+        assert sweeper.sweep(now + 10.5) == 1
+        assert session.get_managed_meta("tool", "search.query") is None
+        assert session.get_managed_meta("tool", "search.page") == 2
+        assert session.get_managed_meta("application", "theme") == "dark"
+        assert sweeper.get_stats().expired_metadata == 1
+
+    def test_rewrites_keep_one_deadline_per_key(self, watched, monkeypatch):
+        """Test that rewriting a key does not grow the heap and still defers its expiry."""
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        sweeper, session = watched(RetentionPolicy(namespace_ttls={"tool": 3600}))
+        for index in range(1000):
+            session.set_managed_meta("tool", "search.page", index)
+        assert sweeper.get_stats().scheduled == 1
+
+        monkeypatch.setattr(time, "time", lambda: now + 1800)
+        session.set_managed_meta("tool", "search.page", "latest")
+        assert sweeper.sweep(now + 3600) == 0
+        assert sweeper.get_stats().scheduled == 1
+        assert sweeper.sweep(now + 5400) == 1
+        assert session.get_managed_meta("tool", "search.page") is None
+
+    def test_reloaded_sessions_keep_their_deadlines(self, monkeypatch):
+        """Test that a session restored from a snapshot or from Zep expires at its original deadline."""
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        original = ChatSession(session_id="session1", user_id="user1")
+        original.set_managed_meta("tool", "search.query", "old")
+
+        monkeypatch.setattr(time, "time", lambda: now + 5)
+        zep_session = zep_types.Session(session_id="session1", user_id="user1",
+                                        metadata=original.to_zep_metadata())
+        for restored in (ChatSession.from_snapshot(original.to_snapshot()), ChatSession.from_zep(zep_session)):
+            sweeper = RetentionSweeper(RetentionPolicy(namespace_ttls={"tool": 10}))
+            sweeper.watch(restored)
+
+            assert sweeper.sweep(now + 9) == 0
+            assert sweeper.sweep(now + 10) == 1
+            assert restored.get_managed_meta("tool", "search.query") is None
+
+    def test_metadata_byte_budget_evicts_least_recently_written(self, watched):
+        """Test that writes over the byte budget evict the oldest keys."""
+        sweeper, session = watched(RetentionPolicy(max_metadata_bytes=60))
+        session.set_meta("first", "x" * 20)
+        session.set_managed_meta("tool", "second", "y" * 20)
+        session.set_meta("first", "x" * 20)
+        session.set_managed_meta("tool", "third", "z" * 20)
+
+        assert session.get_managed_meta("tool", "second") is None
+        assert session.get_meta("first") == "x" * 20
+        stats = sweeper.get_stats()
+        assert stats.evicted_metadata == 1
+        assert stats.evicted_metadata_bytes > 0
+
+    def test_tool_calls_are_capped(self, watched):
+        """Test that only the most recent tool calls are kept."""
+        sweeper, session = watched(RetentionPolicy(max_tool_calls=2))
+        for index in range(5):
+            session.add_tool_call({"tool_name": f"tool{index}", "parameters": {}})
+
+        assert [call.tool_name for call in session.get_tool_calls()] == ["tool3", "tool4"]
+        assert sweeper.get_stats().dropped_tool_calls == 3
+
+    def test_message_age_drops_only_flushed_messages(self, watched):
+        """Test that old messages are dropped once flushed and pending ones are kept."""
+        sweeper, session = watched(RetentionPolicy(max_message_age=60))
+        old = datetime.now() - timedelta(seconds=120)
+        session.add_interaction([{"role": "user", "content": "old question", "timestamp": old},
+                                 {"role": "assistant", "content": "old answer", "timestamp": old}])
+
+        assert sweeper.sweep(time.time() + sweeper.interval) == 0
+        assert len(session.get_messages()) == 2
+
+        session.mark_flushed()
+        session.add_message({"role": "user", "content": "new question"})
+        assert sweeper.sweep(time.time() + 2 * sweeper.interval) == 2
+        assert [m.content for m in session.get_messages()] == ["new question"]
+        assert sweeper.get_stats().expired_messages == 2
+
+    def test_collected_sessions_are_forgotten(self, watched):
+        """Test that the sweeper does not keep sessions alive."""
+        sweeper, session = watched(RetentionPolicy(namespace_ttls={"tool": 1}))
+        session.set_managed_meta("tool", "key", "value")
+        del session
+
+        assert sweeper.get_stats().sessions == 0
+        assert sweeper.sweep(time.time() + 5) == 0
+
+    @pytest.mark.asyncio
+    async def test_background_sweeps(self, watched):
+        """Test that a started sweeper applies deadlines on its own."""
+        sweeper, session = watched(RetentionPolicy(namespace_ttls={"tool": 0.01}))
+        sweeper.interval = 0.01
+        session.set_managed_meta("tool", "key", "value")
+        sweeper.start()
+        try:
+            for _ in range(100):
+                if session.get_managed_meta("tool", "key") is None:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            sweeper.stop()
+
+        assert session.get_managed_meta("tool", "key") is None
+        assert sweeper.get_stats().sweeps > 0
@@ -0,0 +1,100 @@
+"""Unit tests for the session archive formats."""
+
+import os
+
+import pytest
+from agent_c_session.adapters.zep_adapter import ZepAdapter
+from agent_c_session.models import ChatSession
+from agent_c_session.repositories.session_archive import (ArchiveCheckpoint, ArchiveFormat, create_writer,
+                                                          message_from_record, message_record,
+                                                          read_records, session_from_record,
+                                                          session_record)
+
+
+@pytest.fixture
+def make_records():
+    """Fixture for building the archive records of a session and its messages."""
+    def factory(count):
+        session = ChatSession(session_id="session1", user_id="user1", title="Archived",
+                              managed_metadata={"tool.search.query": "\"zep\""})
+        yield session_record(session)
+        for index in range(count):
+            yield message_record(session, {"role": "user", "content": f"message {index}",
+                                           "metadata": {"index": index}})
+
+    return factory
+
+
+class TestSessionArchive:
+    """Test suite for the session archive formats."""
+
+    @pytest.mark.parametrize("archive_format", [ArchiveFormat.NDJSON, ArchiveFormat.PARQUET])
+    def test_round_trip(self, make_records, tmp_path, archive_format):
+        """Test that records written to an archive are read back in order."""
+        if archive_format == ArchiveFormat.PARQUET:
+            pytest.importorskip("pyarrow")
+        path = str(tmp_path / "archive")
+        writer = create_writer(path, archive_format, chunk_size=2)
+        writer.open()
+        for record in make_records(5):
+            writer.write(record)
+        writer.close()
+
+        records = list(read_records(path, archive_format))
+        assert len(records) == 6
+
+        session = session_from_record(records[0])
+        assert session.title == "Archived"
+        assert session.managed_metadata == {"tool.search.query": "\"zep\""}
+        assert message_from_record(records[-1])["metadata"] == {"index": 4}
+
+    def test_named_role_keeps_role_type(self, tmp_path):
+        """Test that a message from a named sender keeps its role type through export and import."""
+        adapter = ZepAdapter()
+        session = ChatSession(session_id="session1", user_id="user1")
+        exported = adapter.to_application_format([{"role": "John Doe", "role_type": "user", "content": "hi"}])
+        path = str(tmp_path / "archive.ndjson")
+        writer = create_writer(path, ArchiveFormat.NDJSON)
+        writer.open()
+        writer.write(message_record(session, exported[0]))
+        writer.close()
+
+        record = next(read_records(path, ArchiveFormat.NDJSON))
+        imported = adapter.to_external_format([message_from_record(record)])
+        assert imported[0]["role"] == "John Doe"
+        assert imported[0]["role_type"] == "user"
+
+    def test_ndjson_resume_discards_uncommitted_records(self, make_records, tmp_path):
+        """Test that reopening at a committed position drops records written after it."""
+        path = str(tmp_path / "archive.ndjson")
+        writer = create_writer(path, ArchiveFormat.NDJSON)
+        writer.open()
+        records = list(make_records(3))
+        writer.write(records[0])
+        writer.write(records[1])
+        position = writer.commit()
+        writer.write(records[2])
+        writer.close()
+
+        writer = create_writer(path, ArchiveFormat.NDJSON)
+        writer.open(position)
+        writer.write(records[3])
+        writer.close()
+
+        assert [r["content"] for r in read_records(path, ArchiveFormat.NDJSON)] == \
+            [None, "message 0", "message 2"]
+
+    def test_checkpoint_round_trip(self, tmp_path):
+        """Test saving and loading a checkpoint."""
+        path = str(tmp_path / "export.checkpoint")
+        ArchiveCheckpoint(format=ArchiveFormat.NDJSON, position=42, user_index=3, user_id="user3",
+                          last_session=("2024-01-01T00:00:00Z", "session7")).save(path)
+
+        checkpoint = ArchiveCheckpoint.load(path, ArchiveFormat.NDJSON)
+        assert checkpoint.position == 42
+        assert (checkpoint.user_index, checkpoint.user_id) == (3, "user3")
+        assert checkpoint.last_session == ("2024-01-01T00:00:00Z", "session7")
+        assert not os.path.exists(f"{path}.tmp")
+
+        with pytest.raises(ValueError):
+            ArchiveCheckpoint.load(path, ArchiveFormat.PARQUET)
@@ -0,0 +1,76 @@
+"""Unit tests for the session change feed."""
+
+import asyncio
+import json
+
+import pytest
+from agent_c_session.repositories.session_events import (OverflowPolicy, SessionEvent, SessionEventBus,
+                                                         SessionEventType, SubscriptionOverflowError,
+                                                         UnixSocketPublisher)
+
+
+@pytest.fixture
+def make_event():
+    """Fixture for building change events."""
+    def factory(event_type=SessionEventType.MESSAGES_ADDED, user_id="user1"):
+        return SessionEvent(event_type=event_type, user_id=user_id, session_id="session1")
+
+    return factory
+
+
+class TestSessionEventBus:
+    """Test suite for the SessionEventBus."""
+
+    @pytest.mark.asyncio
+    async def test_subscription_filters(self, make_event):
+        """Test that subscriptions only receive the events they asked for."""
+        bus = SessionEventBus()
+        subscription = bus.subscribe(event_types=[SessionEventType.SESSION_CREATED], user_id="user1")
+
+        bus.emit(make_event(SessionEventType.MESSAGES_ADDED))
+        bus.emit(make_event(SessionEventType.SESSION_CREATED, user_id="user2"))
+        bus.emit(make_event(SessionEventType.SESSION_CREATED))
+        subscription.close()
+
+        received = [event async for event in subscription]
+        assert [(e.event_type, e.user_id) for e in received] == [(SessionEventType.SESSION_CREATED, "user1")]
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_overflow(self, make_event):
+        """Test that a full DROP_OLDEST subscription keeps the newest events."""
+        bus = SessionEventBus()
+        subscription = bus.subscribe(maxsize=2)
+        for user_id in ["user1", "user2", "user3"]:
+            bus.emit(make_event(user_id=user_id))
+
+        assert subscription.dropped == 1
+        assert (await subscription.__anext__()).user_id == "user2"
+
+    @pytest.mark.asyncio
+    async def test_disconnect_overflow(self, make_event):
+        """Test that a DISCONNECT subscription raises once it falls behind."""
+        bus = SessionEventBus()
+        subscription = bus.subscribe(maxsize=1, overflow=OverflowPolicy.DISCONNECT)
+        bus.emit(make_event())
+        bus.emit(make_event())
+
+        with pytest.raises(SubscriptionOverflowError):
+            await subscription.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_unix_socket_publisher(self, make_event, tmp_path):
+        """Test that events are published as NDJSON to socket consumers."""
+        bus = SessionEventBus()
+        path = str(tmp_path / "events.sock")
+        publisher = UnixSocketPublisher(path)
+        await bus.add_transport(publisher)
+
+        reader, writer = await asyncio.open_unix_connection(path)
+        await asyncio.wait_for(publisher.wait_for_consumers(), timeout=1)
+        bus.emit(make_event())
+
+        line = await asyncio.wait_for(reader.readline(), timeout=1)
+        assert json.loads(line)["event_type"] == "messages_added"
+
+        writer.close()
+        await bus.close()
@@ -0,0 +1,193 @@
+"""Unit tests for the SyncChatSessionRepo."""
+
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import zep_cloud.types as zep_types
+from zep_cloud.core.api_error import ApiError
+from agent_c_session.repositories.sync_chat_session_repo import EventLoopThread, SyncChatSessionRepo
+from agent_c_session.loadgen.fake_backend import BackendModel, FakeZepBackend
+from agent_c_session.models import ChatUser
+from agent_c_session.repositories.retention import RetentionPolicy, RetentionSweeper
+
+
+@pytest.fixture
+def mock_zep_client():
+    """Fixture for mocking the AsyncZep client."""
+    mock = MagicMock()
+    mock.user.add = AsyncMock(return_value=MagicMock())
+    mock.user.delete = AsyncMock()
+    return mock
+
+
+class TestEventLoopThread:
+    """Test suite for the EventLoopThread."""
+
+    def test_run_from_many_threads(self):
+        """Test that coroutines submitted from several threads all run on the loop thread."""
+        loop_thread = EventLoopThread()
+        seen = set()
+
+        async def record():
+            seen.add(threading.current_thread().name)
+            return True
+
+        workers = [threading.Thread(target=lambda: loop_thread.run(record())) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        loop_thread.stop()
+
+        assert seen == {"agent-c-session-loop"}
+
+    def test_run_from_loop_thread_raises(self):
+        """Test that running on the loop thread is refused instead of deadlocking."""
+        loop_thread = EventLoopThread()
+
+        async def nested():
+            loop_thread.run(nested())
+
+        with pytest.raises(RuntimeError):
+            loop_thread.run(nested())
+        loop_thread.stop()
+
+
+class TestSyncChatSessionRepo:
+    """Test suite for the SyncChatSessionRepo."""
+
+    def test_add_chat_user_binds_repo(self, mock_zep_client):
+        """Test that users returned by the facade can use their sync session helpers."""
+        with SyncChatSessionRepo(zep_client=mock_zep_client) as repo:
+            user = repo.add_chat_user(ChatUser(user_id="user1"))
+
+            assert user._repo is repo
+            assert mock_zep_client.user.add.await_count == 1
+
+    def test_calls_from_many_threads(self, mock_zep_client):
+        """Test that one facade instance can be shared between caller threads."""
+        with SyncChatSessionRepo(zep_client=mock_zep_client) as repo:
+            workers = [threading.Thread(target=repo.delete_chat_user, args=(f"user{i}",))
+                       for i in range(8)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        assert mock_zep_client.user.delete.await_count == 8
+
+    def test_bound_user_session_helpers(self, mock_zep_client):
+        """Test listing and searching sessions through a user bound to the facade."""
+        sessions = [zep_types.Session(session_id=f"session{i}", user_id="user1", metadata={"title": f"Chat {i}"})
+                    for i in range(3)]
+        # Search results are per message, best match first
+        results = [zep_types.SessionSearchResult(session_id=f"session{i}", score=score)
+                   for i, score in [(1, 0.9), (1, 0.8), (1, 0.7), (2, 0.6), (0, 0.5)]]
+        mock_zep_client.user.get_sessions = AsyncMock(return_value=sessions)
+        mock_zep_client.memory.search_sessions = AsyncMock(side_effect=lambda limit, **kwargs:
+            zep_types.SessionSearchResponse(results=results[:limit]))
+        mock_zep_client.memory.get_session = AsyncMock(side_effect=lambda session_id, **kwargs: sessions[
+            int(session_id[-1])])
+        mock_zep_client.memory.get = AsyncMock(return_value=zep_types.Memory(messages=[]))
+
+        with SyncChatSessionRepo(zep_client=mock_zep_client) as repo:
+            user = repo.add_chat_user(ChatUser(user_id="user1"))
+
+            assert [s.session_id for s in user.get_sessions(limit=2, offset=1)] == ["session1", "session2"]
+            found = user.search_sessions("hello", limit=2)
+
+        assert [s.session_id for s in found] == ["session1", "session2"]
+        assert found[0].title == "Chat 1"
+        # The first window of two results held a single session
+        assert mock_zep_client.memory.search_sessions.await_count == 2
+
+    def test_user_sessions_carry_their_messages(self):
+        """Test that sessions listed through a bound user are the repo's live sessions with messages."""
+        backend = FakeZepBackend(BackendModel(median_latency=0))
+        with SyncChatSessionRepo(zep_client=backend) as repo:
+            user = repo.add_chat_user(ChatUser(user_id="user1"))
+            created = repo.new_session("user1", "Chat")
+            created.add_message({"role": "user", "content": "hello"})
+            created.flush_sync()
+
+            [listed] = user.get_sessions()
+
+            assert listed is created
+            assert [m.content for m in listed.get_messages()] == ["hello"]
+
+    def test_flush_from_caller_thread_blocks_and_raises(self, mock_zep_client):
+        """Test that a sync flush completes before returning and raises write errors."""
+        mock_zep_client.memory.add_session = AsyncMock()
+        mock_zep_client.memory.add = AsyncMock()
+        mock_zep_client.memory.update_session = AsyncMock()
+
+        repo = SyncChatSessionRepo(zep_client=mock_zep_client)
+        session = repo.new_session("user1", "Test Session")
+        session.add_message({"role": "user", "content": "hello"})
+        session.flush_sync()
+        assert mock_zep_client.memory.add.await_count == 1
+        with pytest.raises(RuntimeError):
+            session.flush()
+
+        mock_zep_client.memory.add.side_effect = ApiError(status_code=500, body="boom")
+        session.add_message({"role": "user", "content": "again"})
+        with pytest.raises(ApiError):
+            session.flush_sync()
+        repo.close()
+
+        assert not repo._loop_thread.is_running
+
+    def test_flush_from_caller_thread_times_out(self, mock_zep_client):
+        """Test that a blocking flush honours the facade timeout and cancels the write."""
+        cancelled = threading.Event()
+
+        async def hang(*args, **kwargs):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        mock_zep_client.memory.add_session = AsyncMock()
+        mock_zep_client.memory.add = AsyncMock(side_effect=hang)
+
+        with SyncChatSessionRepo(zep_client=mock_zep_client, timeout=5) as repo:
+            session = repo.new_session("user1", "Test Session")
+            session.add_message({"role": "user", "content": "hello"})
+            repo.timeout = 0.05
+            with pytest.raises(TimeoutError):
+                session.flush_sync()
+
+            assert repo.repo.sync_timeout == 0.05
+            assert cancelled.wait(1)
+
+    def test_session_changes_are_applied_on_the_loop_thread(self, mock_zep_client):
+        """Test that retention bookkeeping for changes made on a caller thread runs on the loop."""
+        mock_zep_client.memory.add_session = AsyncMock()
+        retention = RetentionSweeper(RetentionPolicy(max_tool_calls=1))
+        threads = set()
+        on_change = retention.on_change
+
+        def record(*args):
+            threads.add(threading.current_thread().name)
+            on_change(*args)
+
+        retention.on_change = record
+        with SyncChatSessionRepo(zep_client=mock_zep_client, retention=retention) as repo:
+            session = repo.new_session("user1", "Test Session")
+            for index in range(3):
+                session.add_tool_call({"tool_name": f"tool{index}", "parameters": {}})
+            # Wait for the callbacks queued on the loop
+            repo._run(asyncio.sleep(0))
+
+        assert threads == {"agent-c-session-loop"}
+        assert [call.tool_name for call in session.get_tool_calls()] == ["tool2"]
+
+    def test_unbound_user_raises(self):
+        """Test that session helpers on an unbound user raise."""
+        user = ChatUser(user_id="user1")
+
+        with pytest.raises(RuntimeError):
+            user.get_sessions()
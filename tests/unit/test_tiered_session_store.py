@@ -0,0 +1,145 @@
+"""Unit tests for the TieredSessionStore."""
+
+import pytest
+from agent_c_session.models import ChatSession
+from agent_c_session.repositories.tiered_session_store import TieredSessionStore, WarmSegmentStore
+
+
+@pytest.fixture
+def make_session():
+    """Fixture for building flushed sessions with a number of messages."""
+    def factory(session_id, messages=0):
+        session = ChatSession(session_id=session_id, user_id="user1")
+        for index in range(messages):
+            session.add_message({"role": "user", "content": f"message {index}"})
+        session.mark_flushed()
+        return session
+
+    return factory
+
+
+class TestTieredSessionStore:
+    """Test suite for the TieredSessionStore."""
+
+    def test_hot_tier_is_bounded_by_bytes(self, make_session):
+        """Test that the hot tier evicts least recently used sessions over its budget."""
+        size = len(make_session("session0", 5).to_snapshot())
+        store = TieredSessionStore(hot_max_bytes=size * 2)
+        for index in range(3):
+            store.put(make_session(f"session{index}", 5))
+
+        assert store.get("session0") is None
+        assert store.get("session2") is not None
+        assert store.get_stats()["hot"].entries == 2
+
+    def test_changed_sessions_are_re_measured(self, make_session):
+        """Test that growth of a cached session counts against the hot tier budget."""
+        size = len(make_session("session0", 5).to_snapshot())
+        store = TieredSessionStore(hot_max_bytes=size * 3)
+        active = make_session("session0", 5)
+        store.put(active)
+        store.put(make_session("session1", 5))
+        for index in range(20):
+            active.add_tool_call({"tool_name": f"tool{index}", "parameters": {"query": "x" * 50}})
+        store.touch(active)
+
+        assert store.get_stats()["hot"].bytes == size + len(active.to_snapshot())
+        store.put(make_session("session2", 5))
+        stats = store.get_stats()["hot"]
+        assert stats.bytes <= size * 3
+        assert stats.entries < 3
+
+    def test_dirty_sessions_are_demoted_with_pending_state(self, make_session, tmp_path):
+        """Test that a session with unflushed messages is demoted and keeps them."""
+        size = len(make_session("session0", 5).to_snapshot())
+        store = TieredSessionStore(hot_max_bytes=size, warm_path=str(tmp_path))
+        dirty = make_session("session0", 5)
+        dirty.add_message({"role": "user", "content": "unflushed"})
+        store.put(dirty)
+        store.put(make_session("session1", 5))
+
+        assert store.hot.peek("session0") is None
+        assert store.get_stats()["hot"].bytes <= size
+        # While in use the live object is served, afterwards its snapshot
+        assert store.get("session0") is dirty
+        store.put(make_session("session1", 5))
+        del dirty
+        restored = store.get("session0")
+        assert [m.content for m in restored.get_pending_messages()] == ["unflushed"]
+
+    def test_one_live_object_per_session(self, make_session):
+        """Test that copies of a live session neither replace it nor are stored."""
+        store = TieredSessionStore()
+        live = make_session("session0", 1)
+        store.put(live)
+        copy = ChatSession.from_snapshot(live.to_snapshot())
+        copy.add_message({"role": "user", "content": "lost"})
+
+        assert store.put(copy) is live
+        store.touch(copy)
+        assert store.get("session0") is live
+
+    def test_touch_promotes_a_demoted_live_session(self, make_session, tmp_path):
+        """Test that a changed session is served live instead of from its stale snapshot."""
+        size = len(make_session("session0", 5).to_snapshot())
+        store = TieredSessionStore(hot_max_bytes=size, warm_path=str(tmp_path))
+        live = make_session("session0", 5)
+        store.put(live)
+        store.put(make_session("session1", 5))
+        live.add_message({"role": "user", "content": "later"})
+        store.touch(live)
+
+        assert store.get("session0") is live
+        assert store.warm.get("session0") is None
+
+    def test_demote_and_promote_through_warm_tier(self, make_session, tmp_path):
+        """Test that evicted sessions are served from disk and promoted back."""
+        size = len(make_session("session0", 5).to_snapshot())
+        store = TieredSessionStore(hot_max_bytes=size, warm_path=str(tmp_path))
+        store.put(make_session("session0", 5))
+        store.put(make_session("session1", 5))
+
+        session = store.get("session0")
+        assert session is not None
+        assert [m.content for m in session.get_messages()][-1] == "message 4"
+
+        stats = store.get_stats()
+        assert stats["hot"].misses == 1
+        assert stats["warm"].hits == 1
+        assert stats["warm"].hit_rate == 1.0
+
+    def test_invalidate(self, make_session, tmp_path):
+        """Test that invalidated sessions are removed from every tier."""
+        store = TieredSessionStore(hot_max_bytes=1, warm_path=str(tmp_path))
+        store.put(make_session("session0"))
+        store.put(make_session("session1"))
+        store.invalidate("session0")
+
+        assert store.get("session0") is None
+
+
+class TestWarmSegmentStore:
+    """Test suite for the WarmSegmentStore."""
+
+    def test_index_rebuilt_on_open(self, tmp_path):
+        """Test that the last version of each session survives a reopen."""
+        store = WarmSegmentStore(str(tmp_path), max_bytes=1 << 20, segment_size=64)
+        store.put("session0", b"v1")
+        store.put("session1", b"other")
+        store.put("session0", b"v2")
+        store.delete("session1")
+        store.close()
+
+        reopened = WarmSegmentStore(str(tmp_path), max_bytes=1 << 20, segment_size=64)
+        assert reopened.get("session0") == b"v2"
+        assert reopened.get("session1") is None
+
+    def test_oldest_segment_dropped_over_budget(self, tmp_path):
+        """Test that the store drops its oldest segment when over budget."""
+        store = WarmSegmentStore(str(tmp_path), max_bytes=100, segment_size=40)
+        for index in range(10):
+            store.put(f"session{index}", b"x" * 20)
+
+        assert store.get("session0") is None
+        assert store.get("session9") == b"x" * 20
+        assert store.stats.bytes <= 100